@@ -2,7 +2,17 @@
 import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
 from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
 from scoring_metrics import (
     calculate_healthcare_score,
     calculate_climate_score,
@@ -17,10 +27,153 @@ project_root = script_dir.parent
 sys.path.append(str(project_root))
 
 from scripts.location_analyzer import Location, WellnessAnalyzer, WELLNESS_CATEGORIES, ALL_FACTORS
+from scripts.score_history import ScoreHistory
+
+if os.name == 'nt':
+    # Enables ANSI escape code handling in the Windows console
+    os.system('')
 
 def clear_screen():
-    """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear the terminal screen with ANSI escape codes (no subprocess per redraw)."""
+    print("\033[2J\033[H", end="", flush=True)
+
+@contextmanager
+def locked_file(file_path):
+    """
+    Hold an exclusive lock on file_path + '.lock' for the duration of a block.
+    
+    Only writers take the lock. Readers never wait: the database file is
+    replaced atomically, so a reader always sees one complete version.
+    """
+    lock_path = f"{file_path}.lock"
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10 seconds; keep waiting
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def location_to_dict(location):
+    """Serialize a location in the locations.json record format."""
+    loc_data = {
+        'name': location.name,
+        'country': location.country,
+        'location_type': location.location_type,
+        'scores': dict(location.scores),
+        'notes': dict(location.notes)
+    }
+    if location.latitude is not None:
+        loc_data['latitude'] = location.latitude
+        loc_data['longitude'] = location.longitude
+    return loc_data
+
+def location_from_dict(loc_data):
+    """Build a location from a locations.json record."""
+    location = Location(
+        loc_data['name'],
+        loc_data['country'],
+        loc_data['location_type'],
+        loc_data.get('latitude'),
+        loc_data.get('longitude')
+    )
+    
+    # Add scores
+    for factor, score in loc_data['scores'].items():
+        note = loc_data['notes'].get(factor)
+        location.add_score(factor, score, note)
+    
+    return location
+
+def _read_records(file_path):
+    """Read the records in a JSON database as a dict keyed by location name."""
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, 'r') as f:
+        data = json.load(f)
+    return {loc_data['name']: loc_data for loc_data in data['locations']}
+
+def _merge_values(base, mine, theirs, conflicts, label):
+    """
+    Three-way merge of one dict (field -> value).
+    
+    A field changed on only one side takes that side's value. A field
+    changed differently on both sides keeps this writer's value and is
+    reported in conflicts.
+    """
+    merged = {}
+    for key in list(theirs) + [k for k in mine if k not in theirs]:
+        base_value, my_value, their_value = base.get(key), mine.get(key), theirs.get(key)
+        if my_value == base_value:
+            value = their_value
+        elif their_value == base_value or their_value == my_value:
+            value = my_value
+        else:
+            value = my_value
+            conflicts.append(f"{label}: {key}")
+        if value is not None:
+            merged[key] = value
+    return merged
+
+def merge_location_records(base, mine, theirs):
+    """
+    Merge this writer's locations with the ones currently on disk.
+    
+    Parameters:
+    - base: Records as this writer last loaded or saved them
+    - mine: Records as this writer has them now
+    - theirs: Records currently on disk (possibly saved by other writers)
+    
+    Locations only one side touched are taken from that side, so concurrent
+    writers never lose each other's additions. When both sides changed the
+    same location, its fields, scores and notes are merged one by one.
+    
+    Returns a tuple (merged records, list of conflicting fields).
+    """
+    merged = {}
+    conflicts = []
+    
+    for name in list(theirs) + [n for n in mine if n not in theirs]:
+        base_rec, my_rec, their_rec = base.get(name), mine.get(name), theirs.get(name)
+        
+        if my_rec == base_rec:
+            record = their_rec
+        elif their_rec == base_rec or their_rec == my_rec:
+            record = my_rec
+        elif my_rec is None or their_rec is None:
+            # Deleted on one side and edited on the other: keep the edit
+            record = my_rec or their_rec
+            conflicts.append(name)
+        else:
+            base_rec = base_rec or {}
+            record = {}
+            fields = {k: v for k, v in my_rec.items() if k not in ('scores', 'notes')}
+            their_fields = {k: v for k, v in their_rec.items() if k not in ('scores', 'notes')}
+            base_fields = {k: v for k, v in base_rec.items() if k not in ('scores', 'notes')}
+            record.update(_merge_values(base_fields, fields, their_fields, conflicts, name))
+            for part in ('scores', 'notes'):
+                record[part] = _merge_values(base_rec.get(part, {}), my_rec.get(part, {}),
+                                             their_rec.get(part, {}), conflicts, f"{name} {part}")
+        
+        if record is not None:
+            merged[name] = record
+    
+    return merged, conflicts
 
 def load_existing_data(file_path):
     """Load existing location data from a JSON file."""
@@ -34,44 +187,294 @@ def load_existing_data(file_path):
         analyzer = WellnessAnalyzer()
         
         for loc_data in data['locations']:
-            location = Location(
-                loc_data['name'],
-                loc_data['country'],
-                loc_data['location_type']
-            )
-            
-            # Add scores
-            for factor, score in loc_data['scores'].items():
-                note = loc_data['notes'].get(factor)
-                location.add_score(factor, score, note)
-            
-            analyzer.add_location(location)
+            analyzer.add_location(location_from_dict(loc_data))
+        
+        # Remember what was loaded so save_data can merge with other writers
+        analyzer.saved_records = {name: location_to_dict(location)
+                                  for name, location in analyzer.locations.items()}
         
         return analyzer
     except Exception as e:
         print(f"Error loading data: {e}")
         return WellnessAnalyzer()
 
-def save_data(analyzer, file_path):
-    """Save location data to a JSON file."""
-    data = {'locations': []}
-    
-    for name, location in analyzer.locations.items():
-        loc_data = {
-            'name': location.name,
-            'country': location.country,
-            'location_type': location.location_type,
-            'scores': location.scores,
-            'notes': location.notes
-        }
-        data['locations'].append(loc_data)
-    
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=4)
-    
-    print(f"Data saved to {file_path}")
+def _write_records(f, records, progress=None):
+    """
+    Write records in the same layout as json.dump({'locations': records}, f, indent=4),
+    one record at a time so progress(done, total) can follow the write.
+    """
+    if not records:
+        json.dump({'locations': []}, f, indent=4)
+        return
+    
+    total = len(records)
+    f.write('{\n    "locations": [\n')
+    for i, record in enumerate(records, 1):
+        text = json.dumps(record, indent=4).replace('\n', '\n        ')
+        f.write(f"        {text}{',' if i < total else ''}\n")
+        if progress and (i % 1000 == 0 or i == total):
+            progress(i, total)
+    f.write('    ]\n}')
+
+def save_data(analyzer, file_path, history_path=None, progress=None, verbose=True, refresh=True):
+    """
+    Save location data to a JSON file.
+    
+    Several people can save to the same file at once. Under an exclusive
+    lock, this writer's changes since it last loaded or saved are merged
+    location by location with whatever is on disk, so nobody's additions
+    are lost. The file is written to a temporary path and then moved into
+    place, so readers never see a half-written database. If history_path is
+    given, the changes are also recorded as a new version in the score
+    history.
+    
+    Parameters:
+    - analyzer: WellnessAnalyzer to save
+    - file_path: Path of the JSON database
+    - history_path: Optional score history file
+    - progress: Optional callback progress(phase, done, total) called as the
+      save moves through its phases ('Preparing', 'Waiting for lock',
+      'Merging', 'Writing', 'Recording history'); done/total count locations
+      where the phase is per location and are 0 otherwise
+    - verbose: Print where the data was saved
+    - refresh: Update the analyzer with locations saved by other writers
+    
+    Returns a tuple (merged records that were written keyed by location
+    name, list of fields where this writer's value replaced someone else's,
+    this writer's own records as they were before merging).
+    """
+    def report(phase, done=0, total=0):
+        if progress:
+            progress(phase, done, total)
+    
+    locations = list(analyzer.locations.values())
+    total = len(locations)
+    mine = {}
+    
+    for i, location in enumerate(locations, 1):
+        mine[location.name] = location_to_dict(location)
+        
+        if i % 1000 == 0 or i == total:
+            report('Preparing', i, total)
+    
+    base = analyzer.saved_records
+    
+    report('Waiting for lock')
+    with locked_file(file_path):
+        report('Merging')
+        merged, conflicts = merge_location_records(base, mine, _read_records(file_path))
+        
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'w') as f:
+            _write_records(f, list(merged.values()), lambda done, count: report('Writing', done, count))
+        os.replace(temp_path, file_path)
+        
+        if refresh:
+            refresh_analyzer(analyzer, merged)
+        
+        if history_path:
+            report('Recording history')
+            recorded = analyzer
+            if not refresh:
+                recorded = WellnessAnalyzer()
+                for loc_data in merged.values():
+                    recorded.add_location(location_from_dict(loc_data))
+            version = ScoreHistory(history_path).record(recorded)
+    
+    if verbose:
+        print(f"Data saved to {file_path}")
+        if conflicts:
+            print(conflict_message(conflicts))
+        if history_path:
+            print(f"Score history at version {version}")
+    
+    return merged, conflicts, mine
+
+def conflict_message(conflicts, limit=5):
+    """Describe the fields where this writer's values won a merge conflict."""
+    shown = ", ".join(conflicts[:limit])
+    if len(conflicts) > limit:
+        shown += f" and {len(conflicts) - limit} more"
+    return f"Kept your values for {len(conflicts)} fields also changed by someone else: {shown}"
+
+def refresh_analyzer(analyzer, merged):
+    """
+    Bring an analyzer up to date with records saved by save_data.
+    
+    Parameters:
+    - analyzer: WellnessAnalyzer to update
+    - merged: Records written by save_data
+    """
+    for name in list(analyzer.locations):
+        if name not in merged:
+            analyzer.remove_location(name)
+    
+    for name, loc_data in merged.items():
+        location = analyzer.locations.get(name)
+        if location is None or location_to_dict(location) != loc_data:
+            analyzer.add_location(location_from_dict(loc_data))
+    
+    analyzer.saved_records = merged
+
+class BackgroundStore:
+    """
+    Loads and saves the location database on a background thread.
+    
+    The menu stays usable while the database loads; anything that needs
+    the data calls get_analyzer(), which waits only if loading is still in
+    progress. Saves work on a snapshot of the locations, so the user can
+    keep adding locations while a save runs. Saves run one after another
+    on the background thread; starting a save while one is running queues
+    it instead of waiting.
+    
+    Locations are never changed in place (add_location replaces them), so
+    a location still being the same object as in a save's snapshot means
+    the user has not touched it since.
+    """
+    def __init__(self, data_file, history_file=None):
+        self.data_file = data_file
+        self.history_file = history_file
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        # Records last written, only used on the background thread
+        self.saved_records = {}
+        self.load_future = self.executor.submit(self._load)
+        self.save_future = None
+        # (future, snapshot locations) of saves not yet applied to the analyzer
+        self.pending_saves = []
+        self.save_progress = ('Preparing', 0, 0)
+        self.lock = threading.Lock()
+    
+    def _load(self):
+        analyzer = load_existing_data(self.data_file)
+        self.saved_records = analyzer.saved_records
+        return analyzer
+    
+    def get_analyzer(self):
+        """Return the loaded analyzer, waiting for the background load if needed."""
+        if not self.load_future.done():
+            print("Loading location database...")
+        analyzer = self.load_future.result()
+        self._apply_finished_saves(analyzer)
+        return analyzer
+    
+    def _apply_finished_saves(self, analyzer):
+        """
+        Pull in what finished saves merged from other writers.
+        
+        Only the locations the merge changed are touched, and only where
+        the analyzer still holds the object that was saved.
+        """
+        while self.pending_saves and self.pending_saves[0][0].done():
+            future, snapshot = self.pending_saves.pop(0)
+            if future.exception():
+                continue
+            merged, _, changes, removed = future.result()
+            for name in removed:
+                if analyzer.locations.get(name) is snapshot.get(name):
+                    analyzer.remove_location(name)
+            for name, loc_data in changes.items():
+                if analyzer.locations.get(name) is snapshot.get(name):
+                    analyzer.add_location(location_from_dict(loc_data))
+            analyzer.saved_records = merged
+    
+    def _update_progress(self, phase, done, total):
+        with self.lock:
+            self.save_progress = (phase, done, total)
+    
+    def _progress_text(self):
+        """Current save phase, with a percentage for the per-location phases."""
+        with self.lock:
+            phase, done, total = self.save_progress
+        if total:
+            return f"{phase}... {100 * done // total}%"
+        return f"{phase}..."
+    
+    def _save(self, snapshot):
+        """
+        Save a snapshot (runs on the background thread, after any earlier save).
+        
+        Returns a tuple (merged records, conflicts, changes, removed) where
+        changes and removed are what the merge did differently from the snapshot.
+        """
+        self._update_progress('Preparing', 0, len(snapshot.locations))
+        snapshot.saved_records = self.saved_records
+        merged, conflicts, mine = save_data(snapshot, self.data_file, self.history_file,
+                                            self._update_progress, verbose=False, refresh=False)
+        self.saved_records = merged
+        
+        changes = {name: loc_data for name, loc_data in merged.items() if mine.get(name) != loc_data}
+        removed = [name for name in mine if name not in merged]
+        return merged, conflicts, changes, removed
+    
+    def start_save(self):
+        """Queue a save of a snapshot of the current locations."""
+        analyzer = self.get_analyzer()
+        
+        # Only the location references are copied here; serializing happens in the background
+        snapshot = WellnessAnalyzer(analyzer.locations.values())
+        future = self.executor.submit(self._save, snapshot)
+        
+        self.save_future = future
+        self.pending_saves.append((future, snapshot.locations))
+    
+    def _conflicts(self):
+        """Conflicts of the latest save, which must have succeeded."""
+        return self.save_future.result()[1]
+    
+    def status(self):
+        """One-line description of the load and save state for the menu."""
+        if not self.load_future.done():
+            return "Loading location database..."
+        
+        status = f"{len(self.load_future.result().locations)} locations loaded"
+        if self.save_future is not None:
+            if not self.save_future.done():
+                status += f" | Saving: {self._progress_text()}"
+                queued = sum(1 for future, _ in self.pending_saves if not future.running() and not future.done())
+                if queued:
+                    status += f" ({queued} more queued)"
+            elif self.save_future.exception():
+                status += f" | Save failed: {self.save_future.exception()}"
+            else:
+                status += " | All changes saved"
+                conflicts = self._conflicts()
+                if conflicts:
+                    status += f" | {conflict_message(conflicts)}"
+        return status
+    
+    def wait_for_save(self):
+        """
+        Block until the latest save (and any queued before it) finishes, showing its progress.
+        
+        Returns True if the save succeeded (or there was none), False if it failed.
+        """
+        if self.save_future is None:
+            return True
+        
+        while True:
+            try:
+                self.save_future.result(timeout=0.1)
+                break
+            except FuturesTimeoutError:
+                pass
+            except Exception as e:
+                print(f"\nError saving data: {e}")
+                return False
+            with self.lock:
+                phase, done, total = self.save_progress
+            filled = 30 * done // total if total else 0
+            count = f"{done}/{total}" if total else ""
+            print(f"\rSaving [{'#' * filled}{'.' * (30 - filled)}] {phase:<18}{count:<16}", end="", flush=True)
+        
+        print(f"\rSaving [{'#' * 30}] {'Done':<18}{'':<16}")
+        print(f"Data saved to {self.data_file}")
+        conflicts = self._conflicts()
+        if conflicts:
+            print(conflict_message(conflicts))
+        return True
+    
+    def close(self):
+        self.executor.shutdown(wait=True)
 
 def add_new_location(analyzer):
     """Add a new location with objectively calculated scores."""
@@ -84,7 +487,21 @@ def add_new_location(analyzer):
     print("\nLocation types: Coastal City, Beach Community, Modern City, Small Town, Village, etc.")
     location_type = input("Location type: ")
     
-    location = Location(name, country, location_type)
+    latitude = longitude = None
+    try:
+        latitude_input = input("Latitude (or press Enter to skip): ")
+        if latitude_input:
+            latitude = float(latitude_input)
+            longitude = float(input("Longitude: "))
+    except ValueError:
+        print("Invalid coordinates. Skipping location coordinates.")
+        latitude = longitude = None
+    
+    try:
+        location = Location(name, country, location_type, latitude, longitude)
+    except ValueError as e:
+        print(f"{e}. Skipping location coordinates.")
+        location = Location(name, country, location_type)
     
     print("\nNow let's add raw data to calculate wellness scores.")
     print("For each metric, enter the data or press Enter to skip.")
@@ -305,30 +722,40 @@ def compare_specific_locations(analyzer):
 def main():
     """Main function to run the location data manager."""
     data_file = os.path.join(project_root, "data", "processed", "locations.json")
+    history_file = os.path.join(project_root, "data", "processed", "score_history.jsonl")
     
-    # Load existing data
-    analyzer = load_existing_data(data_file)
+    # Load existing data in the background so the menu appears immediately
+    store = BackgroundStore(data_file, history_file)
     
     while True:
         clear_screen()
         print("=== Wellness Location Analyzer ===")
+        print(f"({store.status()})\n")
         print("1. Add new location")
         print("2. View all locations")
         print("3. Compare locations")
         print("4. Save and exit")
+        print("5. Save (in background)")
         
         choice = input("\nChoose an option: ")
         
         if choice == '1':
-            analyzer = add_new_location(analyzer)
+            add_new_location(store.get_analyzer())
         elif choice == '2':
-            view_locations(analyzer)
+            view_locations(store.get_analyzer())
         elif choice == '3':
-            compare_specific_locations(analyzer)
+            compare_specific_locations(store.get_analyzer())
         elif choice == '4':
-            save_data(analyzer, data_file)
+            store.start_save()
+            if not store.wait_for_save():
+                # Stay in the menu so unsaved changes are not lost
+                input("Your changes were not saved. Press Enter to return to the menu...")
+                continue
+            store.close()
             print("Goodbye!")
             break
+        elif choice == '5':
+            store.start_save()
         else:
             print("Invalid choice. Please try again.")
             input("Press Enter to continue...")
@@ -0,0 +1,80 @@
+# scripts/check_imputation.py
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import ALL_FACTORS, IMPUTATION_METHODS, impute_score_matrix
+
+
+def planted_matrix(n_rows, missing, seed=0):
+    """
+    Score matrix with a few well separated archetypes and some noise.
+
+    Returns a tuple (full matrix, matrix with the given fraction of cells hidden).
+    """
+    rng = np.random.default_rng(seed)
+    archetypes = rng.integers(1, 11, size=(8, len(ALL_FACTORS)))
+    full = np.clip(archetypes[rng.integers(0, 8, n_rows)] + rng.integers(-1, 2, (n_rows, len(ALL_FACTORS))), 1, 10)
+    hidden = full.astype(float)
+    hidden[rng.random(hidden.shape) < missing] = np.nan
+    return full, hidden
+
+
+def check_knn_uses_neighbours():
+    """
+    kNN must estimate from similar rows, not fall back to the column mean.
+
+    Rows 4-6 score 9 on factor 2 and match row 7 elsewhere, so row 7's
+    missing factor 2 must come out as 9 (the column mean is about 4.4).
+    """
+    matrix = np.full((8, len(ALL_FACTORS)), np.nan)
+    matrix[:, 0] = matrix[:, 1] = [1, 1, 1, 1, 9, 9, 9, 9]
+    matrix[:4, 2] = 1
+    matrix[4:7, 2] = 9
+
+    imputed, _ = impute_score_matrix(matrix, 'knn', k=3)
+    print(f"Planted neighbours: knn estimate {imputed[7, 2]:.2f} (expected 9, column mean {np.nanmean(matrix[:, 2]):.2f})")
+    return imputed[7, 2] == 9
+
+
+def held_out_errors(n_rows, missing, sample_size):
+    """Mean absolute error of each method (and the column mean) on hidden cells."""
+    full, hidden = planted_matrix(n_rows, missing)
+    cells = np.isnan(hidden)
+    groups = np.arange(n_rows) % 10
+
+    errors = {}
+    column_means = np.nanmean(hidden, axis=0)
+    errors['column mean'] = np.abs(np.broadcast_to(column_means, full.shape)[cells] - full[cells]).mean()
+    for method in IMPUTATION_METHODS:
+        imputed, _ = impute_score_matrix(hidden, method, groups, sample_size=sample_size)
+        errors[method] = np.abs(imputed[cells] - full[cells]).mean()
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that imputation estimates beat the column mean")
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--missing', type=float, default=0.3)
+    parser.add_argument('--sample-size', type=int, default=2048)
+    args = parser.parse_args()
+
+    ok = check_knn_uses_neighbours()
+
+    errors = held_out_errors(args.rows, args.missing, args.sample_size)
+    print(f"\nHeld-out error, {args.rows} locations, {args.missing:.0%} missing:")
+    for method, error in errors.items():
+        print(f"{method:<12}{error:>8.3f}")
+
+    if not errors['knn'] < errors['column mean']:
+        print("kNN does no better than the column mean")
+        ok = False
+
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,102 @@
+# scripts/load_test.py
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from urllib.request import urlopen
+
+import numpy as np
+
+# Mix of queries sent to the query service, as (endpoint, params)
+DEFAULT_QUERIES = [
+    ('/compare', {}),
+    ('/compare', {'category': 'Food & Nutrition'}),
+    ('/rank', {'factor': 'Cost of Living', 'top': 3}),
+    ('/rank', {'category': 'Health & Wellbeing'}),
+    ('/filter', {'min_score': 7}),
+    ('/chart', {'factor': 'Healthcare Quality'}),
+]
+
+
+def timed_request(url):
+    """Fetch a URL and return (latency in ms, HTTP status)."""
+    start = time.perf_counter()
+    with urlopen(url) as response:
+        response.read()
+        status = response.status
+    return (time.perf_counter() - start) * 1000, status
+
+
+def _run_phase(base_url, requests, concurrency, extra_params):
+    """
+    Send requests cycling through DEFAULT_QUERIES.
+
+    Returns a tuple (list of (endpoint, latency), elapsed seconds).
+    """
+    urls = []
+    for i in range(requests):
+        endpoint, params = DEFAULT_QUERIES[i % len(DEFAULT_QUERIES)]
+        urls.append((endpoint, f"{base_url}{endpoint}?{urlencode(dict(params, **extra_params))}"))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda item: timed_request(item[1]), urls))
+    elapsed = time.perf_counter() - start
+
+    return [(endpoint, latency) for (endpoint, _), (latency, _) in zip(urls, results)], elapsed
+
+
+def _report(title, timings, elapsed, concurrency):
+    """Print per-endpoint and overall p50/p99 latency for one phase."""
+    latencies = {}
+    for endpoint, latency in timings:
+        latencies.setdefault(endpoint, []).append(latency)
+    all_latencies = [latency for _, latency in timings]
+
+    print(f"=== {title}: {len(timings)} requests, concurrency {concurrency}, "
+          f"{len(timings) / elapsed:.0f} req/s ===")
+    print(f"{'Endpoint':<12}{'Count':>8}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for endpoint, values in latencies.items():
+        p50, p99 = np.percentile(values, [50, 99])
+        print(f"{endpoint:<12}{len(values):>8}{p50:>12.2f}{p99:>12.2f}")
+    p50, p99 = np.percentile(all_latencies, [50, 99])
+    print(f"{'All':<12}{len(all_latencies):>8}{p50:>12.2f}{p99:>12.2f}\n")
+
+
+def run_load_test(base_url, requests, concurrency, mode='both'):
+    """
+    Send requests to the query service and report latency percentiles.
+
+    Cold requests pass nocache=1, so the service recomputes every response.
+    Warm requests are sent after one priming pass over the query mix, so
+    they measure cache hits. The two are reported separately.
+
+    Parameters:
+    - base_url: Service address, e.g. http://127.0.0.1:8000
+    - requests: Number of requests to send per phase
+    - concurrency: Number of requests in flight at once
+    - mode: 'cold', 'warm' or 'both'
+    """
+    if mode not in ('cold', 'warm', 'both'):
+        raise ValueError("mode must be 'cold', 'warm' or 'both'")
+
+    if mode in ('cold', 'both'):
+        timings, elapsed = _run_phase(base_url, requests, concurrency, {'nocache': 1})
+        _report("Cold (uncached)", timings, elapsed, concurrency)
+
+    if mode in ('warm', 'both'):
+        _run_phase(base_url, len(DEFAULT_QUERIES), 1, {})
+        timings, elapsed = _run_phase(base_url, requests, concurrency, {})
+        _report("Warm (cached)", timings, elapsed, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the wellness query service")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--mode', choices=['cold', 'warm', 'both'], default='both',
+                        help="Measure uncached responses, cached responses, or both")
+    args = parser.parse_args()
+
+    run_load_test(args.url, args.requests, args.concurrency, args.mode)
@@ -1,5 +1,6 @@
 # scripts/location_analyzer.py
 import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
 import os
 
@@ -47,11 +48,300 @@ ALL_FACTORS = []
 for category, factors in WELLNESS_CATEGORIES.items():
     ALL_FACTORS.extend(factors)
 
+
+def category_averages(score_matrix):
+    """
+    Calculate category averages for a whole score matrix at once.
+    
+    Parameters:
+    - score_matrix: Array of shape (locations, len(ALL_FACTORS)) with NaN for missing scores
+    
+    Returns an array of shape (locations, len(WELLNESS_CATEGORIES)). Missing
+    factors are left out of the average and a category with no scores is 0,
+    the same as Location.get_category_average.
+    """
+    averages = np.zeros((score_matrix.shape[0], len(WELLNESS_CATEGORIES)))
+    start = 0
+    for i, factors in enumerate(WELLNESS_CATEGORIES.values()):
+        block = score_matrix[:, start:start + len(factors)]
+        counts = np.sum(~np.isnan(block), axis=1)
+        totals = np.nansum(block, axis=1)
+        np.divide(totals, counts, out=averages[:, i], where=counts > 0)
+        start += len(factors)
+    return averages
+
+IMPUTATION_METHODS = ('category', 'country', 'type', 'knn')
+
+
+def _column_means(filled, observed):
+    """Mean of each factor over the locations that have it (NaN if none do)."""
+    counts = observed.sum(axis=0)
+    means = np.full(filled.shape[1], np.nan)
+    np.divide(filled.sum(axis=0), counts, out=means, where=counts > 0)
+    return means
+
+
+def _group_means(filled, observed, codes, n_groups):
+    """Mean of each factor within each group (NaN where the group has no scores)."""
+    sums = np.zeros((n_groups, filled.shape[1]))
+    counts = np.zeros((n_groups, filled.shape[1]))
+    np.add.at(sums, codes, filled)
+    np.add.at(counts, codes, observed)
+    means = np.full_like(sums, np.nan)
+    np.divide(sums, counts, out=means, where=counts > 0)
+    return means
+
+
+def _knn_estimates(filled, observed, k, sample_size=2048, max_cells=2 ** 25, random_state=0):
+    """
+    Estimate every cell from the k most similar locations.
+    
+    Similarity is the mean squared difference over the factors both
+    locations have scored. Neighbours are searched among a fixed random
+    sample of sample_size reference locations (all of them if there are
+    fewer), so the cost grows linearly with the number of locations. Rows
+    are processed in chunks so the distance block stays around max_cells
+    entries.
+    """
+    n_rows = len(filled)
+    weights = observed.astype(float)
+    squares = filled ** 2
+    estimates = np.full(filled.shape, np.nan)
+    needs = np.flatnonzero(~observed.all(axis=1))
+    
+    if n_rows > sample_size:
+        reference = np.sort(np.random.default_rng(random_state).choice(n_rows, sample_size, replace=False))
+    else:
+        reference = np.arange(n_rows)
+    k = min(k, len(reference) - 1)
+    if k < 1:
+        return estimates
+        
+    # Position of each row in the reference sample (-1 if not in it), to skip itself
+    reference_position = np.full(n_rows, -1)
+    reference_position[reference] = np.arange(len(reference))
+    
+    ref_filled, ref_weights, ref_squares = filled[reference], weights[reference], squares[reference]
+    chunk_size = max(1, max_cells // len(reference))
+    for start in range(0, len(needs), chunk_size):
+        rows = needs[start:start + chunk_size]
+        shared = weights[rows] @ ref_weights.T
+        distances = (squares[rows] @ ref_weights.T + weights[rows] @ ref_squares.T
+                     - 2 * filled[rows] @ ref_filled.T)
+        distances = np.where(shared > 0, distances / np.maximum(shared, 1), np.inf)
+        in_reference = np.flatnonzero(reference_position[rows] >= 0)
+        distances[in_reference, reference_position[rows[in_reference]]] = np.inf
+        
+        # Neighbours sharing no factors (infinite distance) are ignored, so a
+        # row with none left keeps NaN and gets the caller's fallback
+        neighbors = np.argpartition(distances, k - 1, axis=1)[:, :k]
+        usable = np.isfinite(np.take_along_axis(distances, neighbors, axis=1))[:, :, None]
+        totals = (ref_filled[neighbors] * usable).sum(axis=1)
+        counts = (ref_weights[neighbors] * usable).sum(axis=1)
+        
+        # estimates[rows] is a copy (fancy indexing), so fill a block and assign it back
+        block = np.full(totals.shape, np.nan)
+        np.divide(totals, counts, out=block, where=counts > 0)
+        estimates[rows] = block
+        
+    return estimates
+
+
+def impute_score_matrix(score_matrix, method='category', groups=None, k=5, sample_size=2048):
+    """
+    Fill missing scores in a whole score matrix at once.
+    
+    Parameters:
+    - score_matrix: Array of shape (locations, len(ALL_FACTORS)) with NaN for missing scores
+    - method: 'category' (the location's own mean for that category),
+      'country' or 'type' (the factor's mean within the group), or
+      'knn' (the factor's mean over the k most similar locations)
+    - groups: Group label per location, required for 'country' and 'type'
+    - k: Number of neighbors for 'knn'
+    - sample_size: Number of reference locations 'knn' searches for neighbors
+    
+    Returns a tuple (imputed matrix, boolean mask of imputed cells). Cells
+    the method cannot estimate fall back to the factor's mean over all
+    locations; factors nobody has scored stay NaN.
+    """
+    if method not in IMPUTATION_METHODS:
+        raise ValueError(f"Unknown imputation method: {method}. Must be one of {IMPUTATION_METHODS}")
+        
+    observed = ~np.isnan(score_matrix)
+    filled = np.where(observed, score_matrix, 0)
+    
+    if method == 'category':
+        estimates = np.full(score_matrix.shape, np.nan)
+        start = 0
+        for factors in WELLNESS_CATEGORIES.values():
+            end = start + len(factors)
+            counts = observed[:, start:end].sum(axis=1)
+            means = np.full(len(score_matrix), np.nan)
+            np.divide(filled[:, start:end].sum(axis=1), counts, out=means, where=counts > 0)
+            estimates[:, start:end] = means[:, None]
+            start = end
+    elif method == 'knn':
+        estimates = _knn_estimates(filled, observed, k, sample_size)
+    else:
+        if groups is None:
+            raise ValueError(f"groups are required for '{method}' imputation")
+        codes, uniques = pd.factorize(np.asarray(groups))
+        estimates = _group_means(filled, observed, codes, len(uniques))[codes]
+        
+    estimates = np.where(np.isnan(estimates), _column_means(filled, observed), estimates)
+    imputed = np.where(observed, score_matrix, estimates)
+    return imputed, ~observed & ~np.isnan(imputed)
+
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _check_coordinates(latitude, longitude):
+    """Raise ValueError unless latitude and longitude are finite and in range (NaN fails too)."""
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("Latitude must be between -90 and 90 and longitude between -180 and 180")
+
+
+def haversine_km(lat, lon, lats, lons):
+    """
+    Great-circle distances in km from one point to many points.
+    
+    Parameters:
+    - lat, lon: Origin in degrees
+    - lats, lons: Arrays of destination latitudes and longitudes in degrees
+    """
+    lat1, lon1 = np.radians(lat), np.radians(lon)
+    lat2, lon2 = np.radians(np.asarray(lats, dtype=float)), np.radians(np.asarray(lons, dtype=float))
+    
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class SpatialIndex:
+    """
+    Grid index over latitude/longitude for radius and nearest-neighbour queries.
+    
+    Points are bucketed into cells of cell_degrees x cell_degrees. A query
+    only computes exact haversine distances for points in the cells its
+    search circle overlaps.
+    """
+    def __init__(self, names, lats, lons, cell_degrees=1.0):
+        """
+        Build the index.
+        
+        Parameters:
+        - names: Name of each point
+        - lats, lons: Coordinates in degrees
+        - cell_degrees: Grid cell size in degrees
+        """
+        self.names = list(names)
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self.cell_degrees = cell_degrees
+        self.n_lat_cells = int(np.ceil(180 / cell_degrees))
+        self.n_lon_cells = int(np.ceil(360 / cell_degrees))
+        
+        keys = self._cell_keys(self.lats, self.lons)
+        self.order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[self.order]
+        unique_keys, starts = np.unique(sorted_keys, return_index=True)
+        ends = np.append(starts[1:], len(sorted_keys))
+        self.cells = {int(key): (start, end) for key, start, end in zip(unique_keys, starts, ends)}
+        
+    def _cell_rows(self, lats):
+        return np.clip(((np.asarray(lats) + 90) // self.cell_degrees).astype(int), 0, self.n_lat_cells - 1)
+        
+    def _cell_cols(self, lons):
+        # Wrap first so 180 and -180 share a column even when the last column is partial
+        wrapped = (np.asarray(lons) + 180) % 360
+        return np.minimum((wrapped // self.cell_degrees).astype(int), self.n_lon_cells - 1)
+        
+    def _cell_keys(self, lats, lons):
+        return self._cell_rows(lats) * self.n_lon_cells + self._cell_cols(lons)
+        
+    def __len__(self):
+        return len(self.names)
+        
+    def _candidates(self, lat, lon, radius_km):
+        """Indices of the points in every cell the search circle can touch."""
+        angle = np.degrees(radius_km / EARTH_RADIUS_KM)
+        low_lat, high_lat = lat - angle, lat + angle
+        
+        rows = range(int(self._cell_rows(max(low_lat, -90))), int(self._cell_rows(min(high_lat, 90))) + 1)
+        
+        # Near a pole (or for huge radii) every longitude is in range
+        if low_lat <= -90 or high_lat >= 90 or angle >= 90:
+            cols = range(self.n_lon_cells)
+        else:
+            half_width = np.degrees(np.arcsin(min(1.0, np.sin(np.radians(angle)) / np.cos(np.radians(lat)))))
+            if 2 * half_width >= 360:
+                cols = range(self.n_lon_cells)
+            else:
+                # Columns come from wrapped longitudes, so a range crossing the
+                # dateline is split in two (cell_degrees need not divide 360)
+                first = int(self._cell_cols(lon - half_width))
+                last = int(self._cell_cols(lon + half_width))
+                if first <= last and 2 * half_width < 180:
+                    cols = range(first, last + 1)
+                else:
+                    cols = list(range(first, self.n_lon_cells)) + list(range(0, last + 1))
+                
+        chunks = []
+        for row in rows:
+            for col in cols:
+                cell = self.cells.get(row * self.n_lon_cells + col)
+                if cell:
+                    chunks.append(self.order[cell[0]:cell[1]])
+                    
+        if not chunks:
+            return np.array([], dtype=int)
+        return np.concatenate(chunks)
+        
+    def within(self, lat, lon, radius_km):
+        """
+        Find all points within radius_km of (lat, lon).
+        
+        Returns a tuple (indices, distances in km), nearest first.
+        """
+        _check_coordinates(lat, lon)
+        if not (np.isfinite(radius_km) and radius_km >= 0):
+            raise ValueError("Radius must be a finite number of kilometres (0 or more)")
+            
+        candidates = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lats[candidates], self.lons[candidates])
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return candidates[order], distances[order]
+        
+    def nearest(self, lat, lon, k=5):
+        """
+        Find the k points nearest to (lat, lon).
+        
+        The search radius starts at one grid cell and doubles until it holds
+        at least k points; points outside that radius cannot be closer.
+        
+        Returns a tuple (indices, distances in km), nearest first.
+        """
+        _check_coordinates(lat, lon)
+        k = min(k, len(self.names))
+        if k == 0:
+            return np.array([], dtype=int), np.array([])
+            
+        radius_km = np.radians(self.cell_degrees) * EARTH_RADIUS_KM
+        while True:
+            indices, distances = self.within(lat, lon, radius_km)
+            if len(indices) >= k or radius_km >= np.pi * EARTH_RADIUS_KM:
+                return indices[:k], distances[:k]
+            radius_km *= 2
+
+
 class Location:
     """
     Represents a location with wellness scores across different factors.
     """
-    def __init__(self, name, country, location_type):
+    def __init__(self, name, country, location_type, latitude=None, longitude=None):
         """
         Initialize a location with basic information.
         
@@ -59,10 +349,19 @@ class Location:
         - name: Name of the location (city, town, etc.)
         - country: Country where the location is situated
         - location_type: Type of location (Coastal City, Small Town, etc.)
+        - latitude: Optional latitude in degrees (-90 to 90)
+        - longitude: Optional longitude in degrees (-180 to 180)
         """
+        if (latitude is None) != (longitude is None):
+            raise ValueError("Specify both latitude and longitude, or neither")
+        if latitude is not None:
+            _check_coordinates(latitude, longitude)
+            
         self.name = name
         self.country = country
         self.location_type = location_type
+        self.latitude = latitude
+        self.longitude = longitude
         self.scores = {}
         self.notes = {}
         
@@ -118,25 +417,313 @@ class WellnessAnalyzer:
     """
     Analyzes and compares wellness factors across different locations.
     """
-    def __init__(self):
-        """Initialize the wellness analyzer."""
-        self.locations = {}
+    def __init__(self, locations=None):
+        """
+        Initialize the wellness analyzer.
+        
+        Parameters:
+        - locations: Optional iterable of Location objects to start with
+        """
+        self.locations = {location.name: location for location in locations or ()}
+        self.clusters = {}
+        self.cluster_labels = {}
+        self._spatial_index = None
+        self._imputed = {}
+        # Records as last loaded or saved by add_location.save_data, used to
+        # merge with other writers
+        self.saved_records = {}
         
     def add_location(self, location):
         """Add a location to the analyzer."""
         self.locations[location.name] = location
+        # A replaced location keeps no cluster until cluster_locations runs again
+        self.clusters.pop(location.name, None)
+        self._spatial_index = None
+        self._imputed = {}
+        
+    def remove_location(self, name):
+        """Remove a location by name. Returns the removed location, or None if not found."""
+        location = self.locations.pop(name, None)
+        if location is not None:
+            self.clusters.pop(name, None)
+            self._spatial_index = None
+            self._imputed = {}
+        return location
         
     def get_location(self, name):
         """Get a location by name."""
         return self.locations.get(name)
         
-    def compare_locations(self, factor=None, category=None):
+    def spatial_index(self):
+        """
+        Get the spatial index of all locations that have coordinates.
+        
+        The index is rebuilt after add_location; call it again (or re-add the
+        location) after changing a location's coordinates in place.
+        """
+        if self._spatial_index is None:
+            located = [loc for loc in self.locations.values() if loc.latitude is not None]
+            self._spatial_index = SpatialIndex(
+                [loc.name for loc in located],
+                [loc.latitude for loc in located],
+                [loc.longitude for loc in located]
+            )
+        return self._spatial_index
+        
+    def _resolve_point(self, origin):
+        """Turn a location name or (lat, lon) pair into coordinates."""
+        if isinstance(origin, str):
+            location = self.get_location(origin)
+            if location is None:
+                raise ValueError(f"Unknown location: {origin}")
+            if location.latitude is None:
+                raise ValueError(f"Location '{origin}' has no coordinates")
+            return location.latitude, location.longitude
+        return origin
+        
+    def _spatial_frame(self, indices, distances):
+        index = self.spatial_index()
+        names = [index.names[i] for i in indices]
+        return pd.DataFrame({
+            'Location': names,
+            'Country': [self.locations[name].country for name in names],
+            'Type': [self.locations[name].location_type for name in names],
+            'Distance (km)': distances
+        })
+        
+    def locations_within(self, origin, radius_km):
+        """
+        Find locations within a distance of a place.
+        
+        Parameters:
+        - origin: Location name or (latitude, longitude) pair
+        - radius_km: Search radius in kilometres
+        
+        Returns a pandas DataFrame of locations with their distance, nearest first.
+        """
+        lat, lon = self._resolve_point(origin)
+        return self._spatial_frame(*self.spatial_index().within(lat, lon, radius_km))
+        
+    def nearest_locations(self, origin, k=5):
+        """
+        Find the k locations nearest to a place.
+        
+        Parameters:
+        - origin: Location name or (latitude, longitude) pair
+        - k: Number of locations to return
+        
+        Returns a pandas DataFrame of locations with their distance, nearest first.
+        """
+        lat, lon = self._resolve_point(origin)
+        return self._spatial_frame(*self.spatial_index().nearest(lat, lon, k))
+        
+    def _location_table(self):
+        """
+        Collect names, countries, types and scores of all locations in one pass.
+        
+        Returns a tuple (names, countries, types, matrix) where matrix has one
+        row per location and one column per factor in ALL_FACTORS, with NaN
+        for missing scores.
+        """
+        names = list(self.locations.keys())
+        countries = []
+        types = []
+        factor_index = {factor: i for i, factor in enumerate(ALL_FACTORS)}
+        matrix = np.full((len(names), len(ALL_FACTORS)), np.nan)
+        
+        for row, name in enumerate(names):
+            location = self.locations[name]
+            countries.append(location.country)
+            types.append(location.location_type)
+            for factor, score in location.scores.items():
+                matrix[row, factor_index[factor]] = score
+                
+        return names, countries, types, matrix
+        
+    def _score_matrix(self):
+        """
+        Build the score matrix for all locations.
+        
+        Returns a tuple (names, matrix), as in _location_table.
+        """
+        names, _, _, matrix = self._location_table()
+        return names, matrix
+        
+    def skyline(self, categories=None, factors=None, max_layers=None):
+        """
+        Find the locations that no other location beats on every dimension.
+        
+        By default the dimensions are the category averages of all
+        WELLNESS_CATEGORIES. A location dominates another when it scores at
+        least as high on every dimension and higher on at least one.
+        
+        Parameters:
+        - categories: Optional list of categories to compare (category averages)
+        - factors: Optional list of factors to compare (missing scores count as 0)
+        - max_layers: Optional number of frontier layers to return (all if None)
+        
+        Returns a pandas DataFrame with a 'Layer' column: layer 1 is the
+        Pareto frontier, layer 2 is the frontier once layer 1 is removed, etc.
+        """
+        if categories and factors:
+            raise ValueError("Specify either factors or categories, not both")
+            
+        names, matrix = self._score_matrix()
+        
+        if factors:
+            for factor in factors:
+                if factor not in ALL_FACTORS:
+                    raise ValueError(f"Unknown factor: {factor}")
+            columns = list(factors)
+            values = np.nan_to_num(matrix[:, [ALL_FACTORS.index(f) for f in factors]])
+        else:
+            all_categories = list(WELLNESS_CATEGORIES.keys())
+            columns = list(categories) if categories else all_categories
+            for category in columns:
+                if category not in WELLNESS_CATEGORIES:
+                    raise ValueError(f"Unknown category: {category}")
+            averages = category_averages(matrix)
+            values = averages[:, [all_categories.index(c) for c in columns]]
+            columns = [f'{c} (Average)' for c in columns]
+            
+        layer_of = _skyline_layers(values, max_layers)
+        
+        keep = np.flatnonzero(layer_of > 0)
+        order = keep[np.lexsort((-values[keep].sum(axis=1), layer_of[keep]))]
+        
+        data = {
+            'Location': [names[i] for i in order],
+            'Country': [self.locations[names[i]].country for i in order],
+            'Type': [self.locations[names[i]].location_type for i in order],
+        }
+        for j, column in enumerate(columns):
+            data[column] = values[order, j]
+        data['Layer'] = layer_of[order]
+        
+        return pd.DataFrame(data)
+        
+    def impute_scores(self, method='category', k=5):
+        """
+        Fill in missing factor scores for every location.
+        
+        Parameters:
+        - method: 'category', 'country', 'type' or 'knn' (see impute_score_matrix)
+        - k: Number of neighbors for 'knn'
+        
+        Returns a tuple of two pandas DataFrames indexed by location name with
+        one column per factor: the imputed scores and a True/False flag for
+        each imputed cell.
+        """
+        names, _, _, imputed, mask = self._imputed_table(method, k)
+        return (pd.DataFrame(imputed, index=names, columns=ALL_FACTORS, copy=True),
+                pd.DataFrame(mask, index=names, columns=ALL_FACTORS, copy=True))
+        
+    def _imputed_table(self, method, k=5):
+        """
+        Location table with missing scores imputed, cached per method and k.
+        
+        The cache is cleared by add_location and is only reused while the
+        raw scores are unchanged, so repeated comparisons impute once.
+        
+        Returns a tuple (names, countries, types, imputed matrix, mask); the
+        arrays are shared with the cache and must not be modified.
+        """
+        names, countries, types, matrix = self._location_table()
+        
+        cached = self._imputed.get((method, k))
+        if (cached is None or cached[0] != names
+                or not np.array_equal(cached[1], matrix, equal_nan=True)):
+            groups = {'country': countries, 'type': types}.get(method)
+            imputed, mask = impute_score_matrix(matrix, method, groups, k)
+            cached = (names, matrix, imputed, mask)
+            self._imputed[(method, k)] = cached
+            
+        return names, countries, types, cached[2], cached[3]
+        
+    def _wide_frame(self, impute=None):
+        """
+        Build every comparison metric for every location with array operations.
+        
+        Returns a tuple (frame, mask) where mask flags imputed cells of the
+        score matrix (None without imputation).
+        """
+        if impute:
+            names, countries, types, matrix, mask = self._imputed_table(impute)
+        else:
+            names, countries, types, matrix = self._location_table()
+            mask = None
+            
+        counts = np.sum(~np.isnan(matrix), axis=1)
+        overall = np.zeros(len(matrix))
+        np.divide(np.nansum(matrix, axis=1), counts, out=overall, where=counts > 0)
+        averages = category_averages(matrix)
+        factor_scores = np.nan_to_num(matrix)
+        
+        data = {'Location': names, 'Country': countries, 'Type': types}
+        for i, factor in enumerate(ALL_FACTORS):
+            data[factor] = factor_scores[:, i]
+        for i, category in enumerate(WELLNESS_CATEGORIES):
+            data[f'{category} (Average)'] = averages[:, i]
+        data['Overall Score'] = overall
+        
+        return pd.DataFrame(data), mask
+        
+    def _apply_within(self, df, within):
+        """
+        Keep only rows within a radius and add their distance before the metrics.
+        
+        Parameters:
+        - df: Frame whose rows follow self.locations order
+        - within: (origin, radius_km) where origin is a location name or (lat, lon)
+        """
+        origin, radius_km = within
+        lat, lon = self._resolve_point(origin)
+        index = self.spatial_index()
+        indices, distances = index.within(lat, lon, radius_km)
+        
+        distance_of = dict(zip((index.names[i] for i in indices), distances))
+        df = df[df['Location'].isin(distance_of)].copy()
+        position = 4 if 'Imputed' in df.columns else 3
+        df.insert(position, 'Distance (km)', df['Location'].map(distance_of))
+        return df.reset_index(drop=True)
+        
+    def comparison_frame(self, impute=None, within=None):
+        """
+        Compare locations on every metric at once.
+        
+        Parameters:
+        - impute: Optional imputation method ('category', 'country', 'type' or
+          'knn'); adds an 'Imputed' column counting each location's filled-in factors
+        - within: Optional (origin, radius_km) to keep only nearby locations,
+          where origin is a location name or (latitude, longitude)
+        
+        Returns a pandas DataFrame with one row per location and columns for
+        all factors (missing scores as 0), all category averages and the
+        overall score.
+        """
+        if not self.locations:
+            return pd.DataFrame()
+            
+        frame, mask = self._wide_frame(impute)
+        if mask is not None:
+            frame.insert(3, 'Imputed', mask.sum(axis=1))
+        if within:
+            frame = self._apply_within(frame, within)
+        return frame
+        
+    def compare_locations(self, factor=None, category=None, impute=None, within=None):
         """
         Compare locations by factor or category.
         
         Parameters:
         - factor: Specific factor to compare
         - category: Category to compare (average of factors)
+        - impute: Optional imputation method ('category', 'country', 'type' or
+          'knn') used to fill missing scores first; adds an 'Imputed' column
+          counting the filled-in factors behind each value
+        - within: Optional (origin, radius_km) to keep only locations within
+          radius_km of origin (a location name or (latitude, longitude));
+          adds a 'Distance (km)' column
         
         Returns a pandas DataFrame with comparison data.
         """
@@ -149,59 +736,137 @@ class WellnessAnalyzer:
         if factor:
             if factor not in ALL_FACTORS:
                 raise ValueError(f"Unknown factor: {factor}")
-                
-            data = {
-                'Location': [],
-                'Country': [],
-                'Type': [],
-                factor: []
-            }
-            
-            for name, location in self.locations.items():
-                data['Location'].append(name)
-                data['Country'].append(location.country)
-                data['Type'].append(location.location_type)
-                data[factor].append(location.get_score(factor) or 0)
-                
-            return pd.DataFrame(data)
-            
+            metric = factor
+            factors = [factor]
         elif category:
             if category not in WELLNESS_CATEGORIES:
                 raise ValueError(f"Unknown category: {category}")
+            metric = f'{category} (Average)'
+            factors = WELLNESS_CATEGORIES[category]
+        else:
+            metric = 'Overall Score'
+            factors = ALL_FACTORS
+            
+        frame, mask = self._wide_frame(impute)
+        df = frame[['Location', 'Country', 'Type', metric]]
+        
+        # Without imputation keep the dtype of the per-location comparison:
+        # a factor whose scores are all integers, or averages that are all 0
+        # (no scores at all), come out as int64
+        if mask is None:
+            if factor:
+                integral = all(isinstance(location.scores.get(factor, 0), (int, np.integer))
+                               for location in self.locations.values())
+            else:
+                integral = not df[metric].any()
+            if integral:
+                df = df.astype({metric: 'int64'})
                 
-            data = {
-                'Location': [],
-                'Country': [],
-                'Type': [],
-                f'{category} (Average)': []
-            }
-            
-            for name, location in self.locations.items():
-                data['Location'].append(name)
-                data['Country'].append(location.country)
-                data['Type'].append(location.location_type)
-                data[f'{category} (Average)'].append(location.get_category_average(category))
-                
-            return pd.DataFrame(data)
+        if mask is not None:
+            columns = [ALL_FACTORS.index(f) for f in factors]
+            df.insert(3, 'Imputed', mask[:, columns].sum(axis=1))
+            
+        if within:
+            df = self._apply_within(df, within)
+            
+        return df
+        
+    def to_arrow(self, impute=None):
+        """
+        Convert the full comparison frame to a pyarrow Table.
+        
+        Numeric columns are handed to Arrow without copying where pandas
+        allows it. Requires the optional pyarrow package.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise ImportError("Arrow export requires pyarrow (pip install pyarrow)")
+            
+        return pa.Table.from_pandas(self.comparison_frame(impute), preserve_index=False)
+        
+    def export_comparison(self, file_path, impute=None):
+        """
+        Export the full comparison frame for downstream analytics.
+        
+        Parameters:
+        - file_path: Output path; .parquet writes Parquet, .arrow or .feather
+          writes the Arrow IPC file format
+        - impute: Optional imputation method (see comparison_frame)
+        """
+        table = self.to_arrow(impute)
+        
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
             
+        if file_path.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            pq.write_table(table, file_path)
+        elif file_path.endswith(('.arrow', '.feather')):
+            import pyarrow.feather as feather
+            feather.write_feather(table, file_path)
         else:
-            # Compare overall scores
-            data = {
-                'Location': [],
-                'Country': [],
-                'Type': [],
-                'Overall Score': []
-            }
-            
-            for name, location in self.locations.items():
-                data['Location'].append(name)
-                data['Country'].append(location.country)
-                data['Type'].append(location.location_type)
-                data['Overall Score'].append(location.get_overall_score())
-                
-            return pd.DataFrame(data)
-    
-    def visualize_comparison(self, factor=None, category=None, save_path=None):
+            raise ValueError("Export path must end in .parquet, .arrow or .feather")
+            
+        print(f"Comparison exported to {file_path}")
+        
+    def cluster_locations(self, n_clusters=4, batch_size=1024, max_iter=100, random_state=0):
+        """
+        Group locations into wellness archetypes by their factor scores.
+        
+        Uses mini-batch k-means over the score matrix. Missing factors are
+        skipped in distances and centroid updates rather than counted as 0,
+        and each step only touches one batch, so the cost grows linearly with
+        the number of locations.
+        
+        Parameters:
+        - n_clusters: Number of archetypes to find
+        - batch_size: Number of locations sampled per update step
+        - max_iter: Maximum number of mini-batch update steps
+        - random_state: Seed for batch sampling and centroid initialization
+        
+        Returns a pandas DataFrame with each location's cluster and archetype
+        label. Assignments are also kept in self.clusters for coloring charts.
+        """
+        if n_clusters < 1:
+            raise ValueError("n_clusters must be at least 1")
+            
+        if not self.locations:
+            return pd.DataFrame()
+            
+        names, matrix = self._score_matrix()
+        n_clusters = min(n_clusters, len(names))
+        
+        rng = np.random.default_rng(random_state)
+        centers = _minibatch_kmeans(matrix, n_clusters, batch_size, max_iter, rng)
+        labels = _assign_clusters(matrix, centers)
+        
+        # Describe each archetype by the factors where its centroid stands out most
+        observed = ~np.isnan(matrix)
+        counts = observed.sum(axis=0)
+        factor_means = np.divide(np.nansum(matrix, axis=0), counts,
+                                 out=np.zeros(len(ALL_FACTORS)), where=counts > 0)
+        self.cluster_labels = {}
+        for cluster in range(n_clusters):
+            difference = np.where(counts > 0, centers[cluster] - factor_means, 0)
+            top = np.argsort(-np.abs(difference))[:2]
+            self.cluster_labels[cluster] = ", ".join(
+                f"{'High' if difference[i] >= 0 else 'Low'} {ALL_FACTORS[i]}" for i in top
+            )
+            
+        self.clusters = dict(zip(names, labels.tolist()))
+        
+        return pd.DataFrame({
+            'Location': names,
+            'Country': [self.locations[name].country for name in names],
+            'Type': [self.locations[name].location_type for name in names],
+            'Cluster': labels,
+            'Archetype': [self.cluster_labels[label] for label in labels]
+        })
+        
+    def visualize_comparison(self, factor=None, category=None, save_path=None, color_by_cluster=False,
+                             show=True):
         """
         Create a bar chart comparing locations by factor or category.
         
@@ -209,7 +874,12 @@ class WellnessAnalyzer:
         - factor: Specific factor to compare
         - category: Category to compare (average of factors)
         - save_path: Optional path to save the visualization
+        - color_by_cluster: Color bars by cluster_locations archetype instead of location type
+        - show: Display the chart; if False the figure is returned instead
         """
+        if color_by_cluster and not self.clusters:
+            raise ValueError("No clusters available. Run cluster_locations first")
+            
         df = self.compare_locations(factor, category)
         
         if df.empty:
@@ -220,18 +890,29 @@ class WellnessAnalyzer:
         metric = df.columns[-1]
         
         # Create the visualization
-        plt.figure(figsize=(10, 6))
+        fig = plt.figure(figsize=(10, 6))
         
         # Create bars with different colors based on location type
         bars = plt.bar(df['Location'], df[metric])
         
-        # Add location type as color
-        location_types = df['Type'].unique()
+        # Add location type (or cluster) as color
+        if color_by_cluster:
+            # Key by cluster id: two clusters can share the same archetype label
+            groups = df['Location'].map(lambda name: self.clusters.get(name, -1))
+            legend_labels = {cluster: f"{cluster}: {label}" for cluster, label in self.cluster_labels.items()}
+            legend_labels[-1] = 'Unclustered'
+            legend_title = 'Archetype'
+        else:
+            groups = df['Type']
+            legend_labels = {}
+            legend_title = 'Location Type'
+            
+        location_types = groups.unique()
         colors = plt.cm.tab10(range(len(location_types)))
         color_map = dict(zip(location_types, colors))
         
         for i, bar in enumerate(bars):
-            location_type = df.iloc[i]['Type']
+            location_type = groups.iloc[i]
             bar.set_color(color_map[location_type])
         
         # Add labels and title
@@ -242,9 +923,9 @@ class WellnessAnalyzer:
         
         # Add a legend for location types
         from matplotlib.lines import Line2D
-        legend_elements = [Line2D([0], [0], color=color, lw=4, label=loc_type) 
+        legend_elements = [Line2D([0], [0], color=color, lw=4, label=legend_labels.get(loc_type, loc_type))
                           for loc_type, color in color_map.items()]
-        plt.legend(handles=legend_elements, title='Location Type')
+        plt.legend(handles=legend_elements, title=legend_title)
         
         # Rotate x-labels for better readability
         plt.xticks(rotation=45, ha='right')
@@ -257,6 +938,9 @@ class WellnessAnalyzer:
             plt.savefig(save_path)
             print(f"Visualization saved to {save_path}")
             
+        if not show:
+            return fig
+            
         plt.show()
         
     def create_radar_chart(self, location_names, category=None, save_path=None):
@@ -341,6 +1025,135 @@ class WellnessAnalyzer:
         plt.show()
 
 
+def _skyline_layers(values, max_layers=None):
+    """
+    Assign each row of values to its skyline (Pareto frontier) layer.
+    
+    Uses sort-filter-skyline: rows are visited in descending order of their
+    sum, so anything that dominates a row has already been placed. Because a
+    row is dominated by some member of every layer before its own and by no
+    member of its own layer or later ones, its layer is found by binary search
+    with one vectorized dominance test per probed layer.
+    
+    Returns an integer array of layer numbers (1-based); rows beyond
+    max_layers get 0.
+    """
+    order = np.argsort(-values.sum(axis=1), kind='stable')
+    layer_of = np.zeros(len(values), dtype=int)
+    
+    # Each layer is a growable buffer of its member rows plus a fill count
+    layers = []
+    
+    def dominated_by(layer, point):
+        members = layer[0][:layer[1]]
+        return bool(np.any(np.all(members >= point, axis=1) & np.any(members > point, axis=1)))
+    
+    for i in order:
+        point = values[i]
+        low, high = 0, len(layers)
+        while low < high:
+            mid = (low + high) // 2
+            if dominated_by(layers[mid], point):
+                low = mid + 1
+            else:
+                high = mid
+                
+        if low == len(layers):
+            if max_layers is not None and low >= max_layers:
+                continue
+            layers.append([np.empty((16, values.shape[1])), 0])
+            
+        layer = layers[low]
+        if layer[1] == len(layer[0]):
+            layer[0] = np.concatenate([layer[0], np.empty_like(layer[0])])
+        layer[0][layer[1]] = point
+        layer[1] += 1
+        layer_of[i] = low + 1
+        
+    return layer_of
+
+
+def _masked_distances(rows, centers):
+    """
+    Squared distances from rows to centers using only each row's scored factors.
+    
+    Distances are rescaled by the fraction of factors present so rows with
+    few scores are comparable to fully scored rows.
+    """
+    observed = ~np.isnan(rows)
+    filled = np.where(observed, rows, 0)
+    weights = observed.astype(float)
+    
+    distances = ((filled ** 2).sum(axis=1)[:, None]
+                 - 2 * filled @ centers.T
+                 + weights @ (centers ** 2).T)
+    present = np.maximum(weights.sum(axis=1), 1)
+    return np.maximum(distances, 0) * (rows.shape[1] / present)[:, None]
+
+
+def _minibatch_kmeans(matrix, n_clusters, batch_size, max_iter, rng, tolerance=1e-4):
+    """
+    Fit k-means centroids on a score matrix that may contain NaN.
+    
+    Centroids are seeded with k-means++ on a bounded sample and refined with
+    mini-batch updates, keeping a per-factor count for each centroid so that
+    only observed scores move it.
+    """
+    n_rows, n_factors = matrix.shape
+    observed = ~np.isnan(matrix)
+    counts = observed.sum(axis=0)
+    factor_means = np.divide(np.nansum(matrix, axis=0), counts,
+                             out=np.zeros(n_factors), where=counts > 0)
+    
+    # k-means++ seeding on a sample
+    sample_size = min(n_rows, max(batch_size, 10 * n_clusters))
+    sample = matrix[rng.choice(n_rows, sample_size, replace=False)]
+    sample_filled = np.where(np.isnan(sample), factor_means, sample)
+    
+    centers = np.empty((n_clusters, n_factors))
+    centers[0] = sample_filled[rng.integers(sample_size)]
+    closest = _masked_distances(sample, centers[:1])[:, 0]
+    for k in range(1, n_clusters):
+        total = closest.sum()
+        if total > 0:
+            choice = rng.choice(sample_size, p=closest / total)
+        else:
+            choice = rng.integers(sample_size)
+        centers[k] = sample_filled[choice]
+        closest = np.minimum(closest, _masked_distances(sample, centers[k:k + 1])[:, 0])
+        
+    # Mini-batch refinement
+    center_counts = np.zeros((n_clusters, n_factors))
+    for _ in range(max_iter):
+        batch = matrix[rng.integers(n_rows, size=min(batch_size, n_rows))]
+        batch_observed = ~np.isnan(batch)
+        labels = np.argmin(_masked_distances(batch, centers), axis=1)
+        
+        membership = np.zeros((len(batch), n_clusters))
+        membership[np.arange(len(batch)), labels] = 1
+        batch_sums = membership.T @ np.where(batch_observed, batch, 0)
+        batch_counts = membership.T @ batch_observed
+        
+        center_counts += batch_counts
+        step = np.divide(batch_sums - batch_counts * centers, center_counts,
+                         out=np.zeros_like(centers), where=center_counts > 0)
+        centers += step
+        
+        if np.abs(step).max() < tolerance:
+            break
+            
+    return centers
+
+
+def _assign_clusters(matrix, centers, chunk_size=65536):
+    """Assign every row to its nearest centroid, one chunk at a time."""
+    labels = np.empty(len(matrix), dtype=int)
+    for start in range(0, len(matrix), chunk_size):
+        chunk = matrix[start:start + chunk_size]
+        labels[start:start + chunk_size] = np.argmin(_masked_distances(chunk, centers), axis=1)
+    return labels
+
+
 # Example usage function (for testing purposes)
 def create_sample_data():
     """Create sample data for demonstration purposes."""
@@ -0,0 +1,337 @@
+# scripts/query_service.py
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import Location
+from scripts.add_location import load_existing_data, save_data
+
+
+class LRUCache:
+    """
+    Thread-safe least-recently-used cache for rendered responses.
+
+    Every clear() bumps a generation counter. A result computed before a
+    write is only stored if no clear happened in between, so a slow reader
+    cannot put stale data back after a write.
+    """
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.generation = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached value for key, or None."""
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value, generation):
+        """Store a value computed during the given generation."""
+        with self._lock:
+            if generation != self.generation:
+                return
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached values (called on every write)."""
+        with self._lock:
+            self._items.clear()
+            self.generation += 1
+
+
+class ReadWriteLock:
+    """
+    Lock that lets any number of readers in at once but gives writers
+    exclusive access. Waiting writers block new readers, so a steady stream
+    of queries cannot starve a write.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writing = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writing or self._writers_waiting:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._writers_waiting += 1
+            while self._writing or self._readers:
+                self._condition.wait()
+            self._writers_waiting -= 1
+            self._writing = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writing = False
+                self._condition.notify_all()
+
+
+class QueryService:
+    """
+    Holds one loaded WellnessAnalyzer and answers queries against it.
+    """
+    def __init__(self, data_file, cache_size=256):
+        """
+        Load the location database once.
+
+        Parameters:
+        - data_file: Path to locations.json
+        - cache_size: Number of responses kept in the LRU cache
+        """
+        self.data_file = data_file
+        self.analyzer = load_existing_data(data_file)
+        self.cache = LRUCache(cache_size)
+        # Queries run concurrently; adding a location waits for them and blocks new ones
+        self.lock = ReadWriteLock()
+        # pyplot keeps global state, so charts are rendered one at a time
+        self.chart_lock = threading.Lock()
+
+    def _comparison(self, params):
+        """Run compare_locations for the factor/category (and optional radius) in params."""
+        within = None
+        if 'radius_km' in params:
+            if 'near' in params:
+                origin = params['near']
+            elif 'lat' in params and 'lon' in params:
+                origin = (float(params['lat']), float(params['lon']))
+            else:
+                raise ValueError("radius_km needs near=<location name> or both lat and lon")
+            within = (origin, float(params['radius_km']))
+        elif 'near' in params or 'lat' in params or 'lon' in params:
+            raise ValueError("near, lat and lon need radius_km")
+
+        with self.lock.read():
+            return self.analyzer.compare_locations(
+                factor=params.get('factor'),
+                category=params.get('category'),
+                impute=params.get('impute'),
+                within=within
+            )
+
+    def compare(self, params):
+        """All locations with the requested metric."""
+        return self._comparison(params).to_dict(orient='records')
+
+    def rank(self, params):
+        """Locations ranked by the requested metric, optionally limited to the top N."""
+        df = self._comparison(params)
+        if df.empty:
+            return []
+        metric = df.columns[-1]
+        df = df.sort_values(metric, ascending=False).reset_index(drop=True)
+        df.insert(0, 'Rank', range(1, len(df) + 1))
+        if 'top' in params:
+            df = df.head(int(params['top']))
+        return df.to_dict(orient='records')
+
+    def filter(self, params):
+        """Locations matching country, type and a minimum metric score."""
+        df = self._comparison(params)
+        if df.empty:
+            return []
+        if 'country' in params:
+            df = df[df['Country'] == params['country']]
+        if 'type' in params:
+            df = df[df['Type'] == params['type']]
+        if 'min_score' in params:
+            df = df[df[df.columns[-1]] >= float(params['min_score'])]
+        return df.to_dict(orient='records')
+
+    def chart(self, params):
+        """Bar chart of the requested metric as PNG bytes."""
+        with self.chart_lock:
+            with self.lock.read():
+                fig = self.analyzer.visualize_comparison(
+                    factor=params.get('factor'),
+                    category=params.get('category'),
+                    show=False
+                )
+            if fig is None:
+                raise ValueError("No data available for visualization")
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png')
+            plt.close(fig)
+        return buffer.getvalue()
+
+    def add_location(self, loc_data):
+        """
+        Add or replace a location from a locations.json style record and save.
+
+        Parameters:
+        - loc_data: Dict with name, country, location_type, scores and optional notes
+
+        Raises RuntimeError if the database could not be saved; the location
+        is then not added.
+        """
+        if not isinstance(loc_data, dict):
+            raise ValueError("Location record must be a JSON object")
+        scores = loc_data.get('scores', {})
+        notes = loc_data.get('notes', {})
+        if not isinstance(scores, dict) or not isinstance(notes, dict):
+            raise ValueError("scores and notes must be JSON objects mapping factor names to values")
+
+        location = Location(loc_data['name'], loc_data['country'], loc_data['location_type'],
+                            loc_data.get('latitude'), loc_data.get('longitude'))
+        for factor, score in scores.items():
+            location.add_score(factor, score, notes.get(factor))
+
+        with self.lock.write():
+            previous = self.analyzer.get_location(location.name)
+            self.analyzer.add_location(location)
+            try:
+                save_data(self.analyzer, self.data_file, verbose=False)
+            except Exception as e:
+                # Keep memory in line with the file: undo the add
+                if previous is None:
+                    self.analyzer.remove_location(location.name)
+                else:
+                    self.analyzer.add_location(previous)
+                raise RuntimeError(f"Could not save location data: {e}") from e
+            finally:
+                # A save also pulls in other writers' changes, so clear in every case
+                self.cache.clear()
+        return {'name': location.name, 'locations': len(self.analyzer.locations)}
+
+
+def make_handler(service):
+    """Create a request handler class bound to a QueryService."""
+    json_endpoints = {
+        '/compare': service.compare,
+        '/rank': service.rank,
+        '/filter': service.filter,
+    }
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status, body, content_type='application/json'):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_error(self, status, message):
+            self._send(status, json.dumps({'error': message}).encode())
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+            if url.path not in json_endpoints and url.path != '/chart':
+                self._send_error(404, f"Unknown endpoint: {url.path}")
+                return
+
+            # nocache=1 always recomputes (used to measure uncached latency)
+            use_cache = params.pop('nocache', '0') in ('', '0')
+            key = (url.path, tuple(sorted(params.items())))
+            cached = service.cache.get(key) if use_cache else None
+            if cached is not None:
+                self._send(200, *cached)
+                return
+
+            generation = service.cache.generation
+            try:
+                if url.path == '/chart':
+                    response = (service.chart(params), 'image/png')
+                else:
+                    result = json_endpoints[url.path](params)
+                    response = (json.dumps(result).encode(), 'application/json')
+            except (ValueError, TypeError) as e:
+                self._send_error(400, str(e))
+                return
+
+            if use_cache:
+                service.cache.put(key, response, generation)
+            self._send(200, *response)
+
+        def do_POST(self):
+            if urlparse(self.path).path != '/locations':
+                self._send_error(404, f"Unknown endpoint: {self.path}")
+                return
+
+            try:
+                length = int(self.headers.get('Content-Length', 0))
+                loc_data = json.loads(self.rfile.read(length))
+                result = service.add_location(loc_data)
+            except KeyError as e:
+                self._send_error(400, f"Missing field: {e}")
+                return
+            except (ValueError, TypeError) as e:
+                # TypeError covers wrongly typed fields, e.g. a non-numeric latitude
+                self._send_error(400, str(e))
+                return
+            except RuntimeError as e:
+                self._send_error(500, str(e))
+                return
+
+            self._send(201, json.dumps(result).encode())
+
+        def log_message(self, format, *args):
+            # Keep the console quiet under load
+            pass
+
+    return Handler
+
+
+def main():
+    """Run the query service until interrupted."""
+    parser = argparse.ArgumentParser(description="Serve wellness location queries over HTTP")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--data', default=os.path.join(project_root, "data", "processed", "locations.json"))
+    parser.add_argument('--cache-size', type=int, default=256)
+    args = parser.parse_args()
+
+    service = QueryService(args.data, args.cache_size)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(service))
+    print(f"Serving {len(service.analyzer.locations)} locations on http://{args.host}:{args.port}")
+    print("Endpoints: /compare /rank /filter /chart (GET), /locations (POST)")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
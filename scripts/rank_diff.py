@@ -0,0 +1,283 @@
+# scripts/rank_diff.py
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+sys.path.append(str(script_dir))
+
+from scripts.location_analyzer import WellnessAnalyzer
+
+# Columns of a comparison frame that describe a location rather than rank it
+ID_COLUMNS = ('Location', 'Country', 'Type', 'Imputed', 'Distance (km)')
+
+
+def snapshot_frame(snapshot):
+    """
+    Get the wide comparison frame for a database snapshot.
+
+    Parameters:
+    - snapshot: A WellnessAnalyzer, a frame from comparison_frame(), or the
+      path of a .parquet/.arrow/.feather file written by export_comparison()
+      (the last two never build Location objects, which matters for very
+      large databases)
+    """
+    if isinstance(snapshot, WellnessAnalyzer):
+        return snapshot.comparison_frame()
+    if isinstance(snapshot, pd.DataFrame):
+        return snapshot
+    if isinstance(snapshot, (str, os.PathLike)):
+        path = str(snapshot)
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path)
+        if path.endswith(('.arrow', '.feather')):
+            return pd.read_feather(path)
+    raise ValueError("Snapshot must be a WellnessAnalyzer, a comparison frame or a .parquet/.arrow/.feather path")
+
+
+def _descending_ranks(values):
+    """
+    Competition ranks (1 = best, ties share the best rank) for each column.
+
+    Each column is sorted once; a value's rank is the position where its
+    run of equal values starts in the sorted column. NaN stays NaN.
+    """
+    columns = np.asfortranarray(-values)
+    ranks = np.empty(values.shape)
+    positions = np.arange(len(values))
+
+    for j in range(values.shape[1]):
+        order = np.argsort(columns[:, j])
+        sorted_values = columns[order, j]
+        starts = np.empty(len(values), dtype=bool)
+        starts[:1] = True
+        starts[1:] = sorted_values[1:] != sorted_values[:-1]
+        ranks[order, j] = np.maximum.accumulate(np.where(starts, positions, 0)) + 1
+
+    ranks[np.isnan(values)] = np.nan
+    return ranks
+
+
+class RankDiff:
+    """
+    Differences between two database versions: changed scores and rank moves.
+
+    Both snapshots are aligned into (location x dimension) matrices once,
+    where the dimensions are every factor, category average and the overall
+    score. All comparisons are array operations on those matrices.
+    """
+    def __init__(self, old, new):
+        """
+        Compare two snapshots.
+
+        Parameters:
+        - old: Earlier snapshot (see snapshot_frame for accepted types)
+        - new: Later snapshot
+        """
+        old_frame = snapshot_frame(old)
+        new_frame = snapshot_frame(new)
+
+        if old_frame.empty and new_frame.empty:
+            raise ValueError("Both snapshots are empty")
+
+        self.dimensions = [column for column in new_frame.columns
+                           if column not in ID_COLUMNS and column in old_frame.columns]
+        if not self.dimensions:
+            self.dimensions = [column for column in (new_frame if not new_frame.empty else old_frame).columns
+                               if column not in ID_COLUMNS]
+
+        # Location names are unique within a snapshot, so one hash lookup per
+        # new location aligns the two (object dtype keeps the lookup in C)
+        old_names = pd.Index(old_frame['Location'] if not old_frame.empty else [], dtype=object)
+        new_names = pd.Index(new_frame['Location'] if not new_frame.empty else [], dtype=object)
+        positions = old_names.get_indexer(new_names)
+        added = positions < 0
+        self.locations = old_names.append(new_names[added])
+
+        new_rows = positions.copy()
+        new_rows[added] = len(old_names) + np.arange(added.sum())
+        old_rows = np.arange(len(old_names))
+
+        self.old_scores, self.old_ranks = self._align(old_frame, old_rows)
+        self.new_scores, self.new_ranks = self._align(new_frame, new_rows)
+
+        self.in_old = np.zeros(len(self.locations), dtype=bool)
+        self.in_old[old_rows] = True
+        self.in_new = np.zeros(len(self.locations), dtype=bool)
+        self.in_new[new_rows] = True
+
+    def _align(self, frame, rows):
+        """Scores and ranks of one snapshot, placed at the given rows (NaN where absent)."""
+        scores = np.full((len(self.locations), len(self.dimensions)), np.nan)
+        ranks = np.full_like(scores, np.nan)
+        if frame.empty:
+            return scores, ranks
+
+        values = frame[self.dimensions].to_numpy(dtype=float)
+        scores[rows] = values
+        ranks[rows] = _descending_ranks(values)
+        return scores, ranks
+
+    def _dimension_index(self, dimension):
+        if dimension not in self.dimensions:
+            raise ValueError(f"Unknown ranking dimension: {dimension}")
+        return self.dimensions.index(dimension)
+
+    def changed_cells(self):
+        """
+        Every score that differs between the snapshots.
+
+        Returns a pandas DataFrame with Location, Dimension, Old Score,
+        New Score and Change (NaN scores mean the location was absent).
+        """
+        same = (self.old_scores == self.new_scores) | (np.isnan(self.old_scores) & np.isnan(self.new_scores))
+        rows, cols = np.nonzero(~same)
+        old = self.old_scores[rows, cols]
+        new = self.new_scores[rows, cols]
+
+        return pd.DataFrame({
+            'Location': self.locations[rows],
+            'Dimension': np.asarray(self.dimensions, dtype=object)[cols],
+            'Old Score': old,
+            'New Score': new,
+            'Change': new - old
+        })
+
+    def rank_changes(self, dimension='Overall Score'):
+        """
+        Locations whose rank moved in one dimension, biggest moves first.
+
+        Parameters:
+        - dimension: Factor, '<category> (Average)' or 'Overall Score'
+
+        Returns a pandas DataFrame with old and new score and rank. Rank
+        Change is positive for moving up; entered or removed locations have
+        NaN on the side where they are absent.
+        """
+        j = self._dimension_index(dimension)
+        old_rank, new_rank = self.old_ranks[:, j], self.new_ranks[:, j]
+        moved = ~((old_rank == new_rank) | (np.isnan(old_rank) & np.isnan(new_rank)))
+        rows = np.flatnonzero(moved)
+
+        change = old_rank[rows] - new_rank[rows]
+        order = np.lexsort((rows, -np.nan_to_num(np.abs(change), nan=np.inf)))
+        rows, change = rows[order], change[order]
+
+        return pd.DataFrame({
+            'Location': self.locations[rows],
+            'Old Score': self.old_scores[rows, j],
+            'New Score': self.new_scores[rows, j],
+            'Old Rank': old_rank[rows],
+            'New Rank': new_rank[rows],
+            'Rank Change': change
+        })
+
+    def summary(self):
+        """
+        One row per ranking dimension summarising what moved.
+
+        Returns a pandas DataFrame with counts of changed scores, locations
+        moving up or down, entering or leaving, and the largest rise and fall.
+        """
+        present = self.in_old & self.in_new
+        changes = self.old_ranks - self.new_ranks
+        changes[~present] = 0
+
+        same = (self.old_scores == self.new_scores) | (np.isnan(self.old_scores) & np.isnan(self.new_scores))
+
+        data = {
+            'Dimension': self.dimensions,
+            'Changed Scores': (~same).sum(axis=0),
+            'Moved Up': (changes > 0).sum(axis=0),
+            'Moved Down': (changes < 0).sum(axis=0),
+            'Entered': np.full(len(self.dimensions), (~self.in_old).sum()),
+            'Left': np.full(len(self.dimensions), (~self.in_new).sum()),
+        }
+
+        if len(self.locations):
+            rise_rows = np.argmax(changes, axis=0)
+            fall_rows = np.argmin(changes, axis=0)
+            columns = np.arange(len(self.dimensions))
+            rise = changes[rise_rows, columns]
+            fall = changes[fall_rows, columns]
+            data['Largest Rise'] = np.where(rise > 0, self.locations[rise_rows], None)
+            data['Rise'] = rise
+            data['Largest Fall'] = np.where(fall < 0, self.locations[fall_rows], None)
+            data['Fall'] = fall
+
+        return pd.DataFrame(data)
+
+    def explain(self, location):
+        """Changed scores for one location, i.e. why its ranks moved."""
+        row = self.locations.get_loc(location)
+        old, new = self.old_scores[row], self.new_scores[row]
+        changed = np.flatnonzero(~((old == new) | (np.isnan(old) & np.isnan(new))))
+
+        return pd.DataFrame({
+            'Dimension': [self.dimensions[j] for j in changed],
+            'Old Score': old[changed],
+            'New Score': new[changed],
+            'Change': new[changed] - old[changed]
+        })
+
+    def top_movers(self, dimension='Overall Score', n=10):
+        """
+        The n biggest rank moves in a dimension, with the factors behind them.
+
+        Returns rank_changes(dimension) limited to n rows plus a 'Changed
+        Factors' column listing each location's changed factor scores.
+        """
+        movers = self.rank_changes(dimension).head(n)
+        factor_columns = [j for j, d in enumerate(self.dimensions)
+                          if not d.endswith(' (Average)') and d != 'Overall Score']
+
+        reasons = []
+        for name in movers['Location']:
+            row = self.locations.get_loc(name)
+            if not self.in_old[row]:
+                reasons.append("New location")
+                continue
+            if not self.in_new[row]:
+                reasons.append("Removed")
+                continue
+            old, new = self.old_scores[row, factor_columns], self.new_scores[row, factor_columns]
+            changed = ~((old == new) | (np.isnan(old) & np.isnan(new)))
+            reasons.append(", ".join(
+                f"{self.dimensions[factor_columns[k]]} {old[k]:g}->{new[k]:g}" for k in np.flatnonzero(changed)
+            ))
+
+        movers = movers.copy()
+        movers['Changed Factors'] = reasons
+        return movers.reset_index(drop=True)
+
+
+def diff_snapshots(old, new):
+    """Compare two database snapshots (see RankDiff)."""
+    return RankDiff(old, new)
+
+
+if __name__ == "__main__":
+    from scripts.add_location import load_existing_data
+
+    parser = argparse.ArgumentParser(description="Show how rankings moved between two database versions")
+    parser.add_argument('old', help="Earlier locations.json, .parquet or .arrow file")
+    parser.add_argument('new', help="Later locations.json, .parquet or .arrow file")
+    parser.add_argument('--dimension', default='Overall Score')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    snapshots = [load_existing_data(path) if path.endswith('.json') else path for path in (args.old, args.new)]
+    diff = RankDiff(*snapshots)
+
+    pd.set_option('display.width', 200)
+    print("=== Rank Change Summary ===")
+    print(diff.summary().to_string(index=False))
+    print(f"\n=== Top Movers: {args.dimension} ===")
+    print(diff.top_movers(args.dimension, args.top).to_string(index=False))
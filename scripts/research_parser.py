@@ -0,0 +1,275 @@
+# scripts/research_parser.py
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import Location, WellnessAnalyzer, ALL_FACTORS
+from scripts.scoring_metrics import (
+    calculate_healthcare_score,
+    calculate_climate_score,
+    calculate_food_quality_score,
+    calculate_cost_of_living_score,
+    calculate_beach_access_score
+)
+
+# Template field labels (docs/location_research_template.md) -> metric keys
+METRIC_FIELDS = {
+    "Healthcare System Rank": "healthcare_rank",
+    "Hospital Beds per 1000 People": "hospital_beds",
+    "Doctors per 1000 People": "doctors",
+    "Sunny Days per Year": "sunny_days",
+    "Average Temperature (Celsius)": "avg_temp",
+    "Annual Rainfall (mm)": "rainfall",
+    "Organic Farms per 100,000 People": "organic_farms",
+    "Traditional Cuisine Preservation (1-10)": "cuisine_preservation",
+    "Food Safety Rating (1-10)": "food_safety",
+    "Monthly Costs for Single Person (USD)": "monthly_cost",
+    "Purchasing Power (relative to NYC=100)": "purchasing_power",
+    "Housing Price to Income Ratio": "housing_ratio",
+    "Distance to Nearest Beach (km)": "beach_distance",
+    "Beach Quality Rating (1-10)": "beach_quality",
+    "Beach Facilities Rating (1-10)": "beach_facilities",
+}
+
+BASIC_FIELDS = {
+    "Location Name": "name",
+    "Country": "country",
+    "Location Type": "location_type",
+}
+
+FIELD_PATTERN = re.compile(r"^\s*-\s*\*\*(.+?)\*\*:\s*(.*?)\s*$")
+NUMBER_PATTERN = re.compile(r"-?\d[\d,]*(?:\.\d+)?")
+
+CACHE_VERSION = 1
+
+
+def _parse_number(text):
+    """Extract the first number from a field value (e.g. '1,300' or '18 (UK's global ranking)')."""
+    match = NUMBER_PATTERN.search(text)
+    if not match:
+        return None
+    return float(match.group().replace(",", ""))
+
+
+def parse_research_text(text):
+    """
+    Parse the fields of a location research document.
+
+    Returns a dict with the basic information, the raw template metrics and
+    any wellness factors scored directly (e.g. under Additional Metrics).
+    """
+    result = {'name': None, 'country': None, 'location_type': None,
+              'metrics': {}, 'factor_scores': {}}
+
+    for line in text.splitlines():
+        match = FIELD_PATTERN.match(line)
+        if not match:
+            continue
+        label, value = match.groups()
+
+        if label in BASIC_FIELDS:
+            if value:
+                result[BASIC_FIELDS[label]] = value
+        elif label in METRIC_FIELDS:
+            number = _parse_number(value)
+            if number is not None:
+                result['metrics'][METRIC_FIELDS[label]] = number
+        elif label in ALL_FACTORS:
+            number = _parse_number(value)
+            if number is not None and 1 <= number <= 10:
+                result['factor_scores'][label] = number
+
+    return result
+
+
+def calculate_scores(metrics):
+    """
+    Turn raw metrics into wellness scores using the scoring_metrics calculators.
+
+    Missing metrics are handled the same way as in add_new_location: they
+    default to 0 (or no beach distance), and a factor is only scored when at
+    least one of its metrics is present.
+
+    Returns a tuple (scores, notes) of dicts keyed by factor.
+    """
+    scores = {}
+    notes = {}
+
+    if any(key in metrics for key in ('healthcare_rank', 'hospital_beds', 'doctors')):
+        rank = metrics.get('healthcare_rank', 0)
+        beds = metrics.get('hospital_beds', 0)
+        doctors = metrics.get('doctors', 0)
+        scores["Healthcare Quality"] = calculate_healthcare_score(rank, beds, doctors)
+        notes["Healthcare Quality"] = f"Based on: Rank={rank}, Beds={beds}/1000, Doctors={doctors}/1000"
+
+    if any(key in metrics for key in ('sunny_days', 'avg_temp', 'rainfall')):
+        sunny_days = metrics.get('sunny_days', 0)
+        avg_temp = metrics.get('avg_temp', 0)
+        rainfall = metrics.get('rainfall', 0)
+        scores["Sunlight/Climate"] = calculate_climate_score(sunny_days, avg_temp, rainfall)
+        notes["Sunlight/Climate"] = f"Based on: {sunny_days} sunny days, {avg_temp}°C avg temp, {rainfall}mm rainfall"
+
+    if any(key in metrics for key in ('organic_farms', 'cuisine_preservation', 'food_safety')):
+        organic_farms = metrics.get('organic_farms', 0)
+        preservation = metrics.get('cuisine_preservation', 0)
+        safety = metrics.get('food_safety', 0)
+        scores["Food Quality (Natural/Traditional)"] = calculate_food_quality_score(organic_farms, preservation, safety)
+        notes["Food Quality (Natural/Traditional)"] = (
+            f"Based on: {organic_farms} organic farms per 100k, cuisine preservation={preservation}, safety={safety}")
+
+    if any(key in metrics for key in ('monthly_cost', 'purchasing_power', 'housing_ratio')):
+        monthly_cost = metrics.get('monthly_cost', 0)
+        purchasing_power = metrics.get('purchasing_power', 0)
+        housing_ratio = metrics.get('housing_ratio', 0)
+        scores["Cost of Living"] = calculate_cost_of_living_score(monthly_cost, purchasing_power, housing_ratio)
+        notes["Cost of Living"] = (
+            f"Based on: ${monthly_cost} monthly costs, {purchasing_power} purchasing power, {housing_ratio} housing ratio")
+
+    if any(key in metrics for key in ('beach_distance', 'beach_quality', 'beach_facilities')):
+        distance = metrics.get('beach_distance')
+        quality = metrics.get('beach_quality', 0)
+        facilities = metrics.get('beach_facilities', 0)
+        scores["Beach/Coastal Access"] = calculate_beach_access_score(distance, quality, facilities)
+        notes["Beach/Coastal Access"] = f"Based on: {distance}km to beach, quality={quality}, facilities={facilities}"
+
+    return scores, notes
+
+
+def parse_research_file(file_path):
+    """Parse one research file and calculate its scores."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    result = parse_research_text(text)
+    result['scores'], result['notes'] = calculate_scores(result['metrics'])
+    result['file'] = str(file_path)
+    return result
+
+
+def _file_hash(file_path):
+    """SHA-256 of a file's contents."""
+    with open(file_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _load_cache(cache_path):
+    """Load the parse cache, discarding it if unreadable or from another version."""
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get('version') != CACHE_VERSION:
+        return {}
+    return cache.get('files', {})
+
+
+def parse_research_directory(directory, cache_path=None, max_workers=None):
+    """
+    Parse every research markdown file in a directory, in parallel.
+
+    A file is re-parsed only if it changed: an unchanged mtime and size
+    skips it outright, and a changed mtime with the same content hash reuses
+    the cached result.
+
+    Parameters:
+    - directory: Folder containing *_research.md files
+    - cache_path: Optional JSON file for cached parse results
+    - max_workers: Number of worker processes (defaults to CPU count)
+
+    Returns a list of parsed results (one per file, sorted by path).
+    """
+    files = sorted(str(path) for path in Path(directory).glob("*_research.md"))
+    cached = _load_cache(cache_path)
+
+    results = {}
+    entries = {}
+    to_parse = []
+
+    for file_path in files:
+        stat = os.stat(file_path)
+        entry = cached.get(file_path)
+
+        if entry and entry['mtime'] == stat.st_mtime and entry['size'] == stat.st_size:
+            results[file_path] = entry['result']
+            entries[file_path] = entry
+            continue
+
+        digest = _file_hash(file_path)
+        if entry and entry['hash'] == digest:
+            results[file_path] = entry['result']
+            entries[file_path] = dict(entry, mtime=stat.st_mtime, size=stat.st_size)
+            continue
+
+        to_parse.append(file_path)
+        entries[file_path] = {'mtime': stat.st_mtime, 'size': stat.st_size, 'hash': digest}
+
+    if len(to_parse) > 1:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            parsed = list(pool.map(parse_research_file, to_parse))
+    else:
+        parsed = [parse_research_file(file_path) for file_path in to_parse]
+
+    for file_path, result in zip(to_parse, parsed):
+        results[file_path] = result
+        entries[file_path]['result'] = result
+
+    if cache_path:
+        directory = os.path.dirname(cache_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(cache_path, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': entries}, f)
+
+    return [results[file_path] for file_path in files]
+
+
+def build_analyzer(results, analyzer=None):
+    """
+    Add parsed research results to a WellnessAnalyzer.
+
+    Calculated scores take precedence over directly entered factor scores.
+    Files without a location name (e.g. empty drafts) are skipped.
+
+    Parameters:
+    - results: Parsed results from parse_research_directory
+    - analyzer: Optional analyzer to add to (a new one is created if None)
+    """
+    if analyzer is None:
+        analyzer = WellnessAnalyzer()
+
+    for result in results:
+        if not result['name']:
+            continue
+
+        location = Location(result['name'], result['country'] or "", result['location_type'] or "")
+        for factor, score in result['factor_scores'].items():
+            location.add_score(factor, score, "Source: research file")
+        for factor, score in result['scores'].items():
+            location.add_score(factor, score, result['notes'].get(factor))
+
+        analyzer.add_location(location)
+
+    return analyzer
+
+
+if __name__ == "__main__":
+    research_dir = os.path.join(project_root, "docs", "research")
+    cache_file = os.path.join(project_root, "data", "processed", "research_cache.json")
+
+    results = parse_research_directory(research_dir, cache_file)
+    analyzer = build_analyzer(results)
+
+    print(f"Parsed {len(results)} research files, {len(analyzer.locations)} with location data")
+    print(analyzer.compare_locations())
@@ -0,0 +1,197 @@
+# scripts/score_history.py
+import json
+import os
+import sys
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import Location, WellnessAnalyzer
+
+
+class ScoreHistory:
+    """
+    Versioned history of location scores stored as deltas.
+
+    Each recorded version is one JSON line holding only the cells that
+    changed since the previous version, so the file grows with the number
+    of changes rather than with database size times versions. On load, every
+    cell's changes are indexed by version, which makes point-in-time lookups
+    a binary search per cell.
+    """
+    def __init__(self, file_path):
+        """
+        Open (or start) a score history file.
+
+        Parameters:
+        - file_path: Path to the JSON lines history file
+        """
+        self.file_path = file_path
+        self.versions = []
+
+        # location -> [(version, (country, location_type, latitude, longitude) or None)]
+        # (versions recorded before coordinates were added hold only the first two)
+        self.info_history = {}
+        # (location, factor) -> [(version, value or None)]
+        self.score_history = {}
+        self.note_history = {}
+
+        # Latest state, used to compute the next delta
+        self.current_info = {}
+        self.current_scores = {}
+        self.current_notes = {}
+
+        if os.path.exists(file_path):
+            with open(file_path, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+
+    def _apply(self, entry):
+        """Apply one delta entry to the in-memory indexes."""
+        version = entry['version']
+        self.versions.append({
+            'version': version,
+            'timestamp': entry['timestamp'],
+            'comment': entry.get('comment')
+        })
+
+        for name, info in entry.get('info', []):
+            info = tuple(info) if info is not None else None
+            self.info_history.setdefault(name, []).append((version, info))
+            self._set(self.current_info, name, info)
+
+        for name, factor, score in entry.get('scores', []):
+            self.score_history.setdefault((name, factor), []).append((version, score))
+            self._set(self.current_scores, (name, factor), score)
+
+        for name, factor, note in entry.get('notes', []):
+            self.note_history.setdefault((name, factor), []).append((version, note))
+            self._set(self.current_notes, (name, factor), note)
+
+    @staticmethod
+    def _set(state, key, value):
+        """Set or clear a cell in a state dict."""
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
+
+    @staticmethod
+    def _diff(old, new):
+        """List the cells that differ between two state dicts (None marks removal)."""
+        changes = [(key, value) for key, value in new.items() if old.get(key) != value]
+        changes.extend((key, None) for key in old if key not in new)
+        return changes
+
+    @property
+    def latest_version(self):
+        """Number of the most recent version (0 if nothing has been recorded)."""
+        return self.versions[-1]['version'] if self.versions else 0
+
+    def record(self, analyzer, comment=None):
+        """
+        Record the analyzer's current scores as a new version.
+
+        Parameters:
+        - analyzer: WellnessAnalyzer holding the scores to record
+        - comment: Optional description of the research round
+
+        Returns the new version number, or the latest version if nothing changed.
+        """
+        info, scores, notes = {}, {}, {}
+        for name, location in analyzer.locations.items():
+            info[name] = (location.country, location.location_type, location.latitude, location.longitude)
+            for factor, score in location.scores.items():
+                scores[(name, factor)] = score
+            for factor, note in location.notes.items():
+                notes[(name, factor)] = note
+
+        info_changes = self._diff(self.current_info, info)
+        score_changes = self._diff(self.current_scores, scores)
+        note_changes = self._diff(self.current_notes, notes)
+
+        if not (info_changes or score_changes or note_changes):
+            return self.latest_version
+
+        entry = {
+            'version': self.latest_version + 1,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'comment': comment,
+            'info': [[name, list(value) if value else None] for name, value in info_changes],
+            'scores': [[name, factor, value] for (name, factor), value in score_changes],
+            'notes': [[name, factor, value] for (name, factor), value in note_changes]
+        }
+
+        directory = os.path.dirname(self.file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.file_path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+
+        self._apply(entry)
+        return entry['version']
+
+    @staticmethod
+    def _value_at(history, version):
+        """Value of a cell as of a version, using binary search over its changes."""
+        index = bisect_right(history, version, key=lambda change: change[0])
+        return history[index - 1][1] if index else None
+
+    def get_analyzer(self, version=None):
+        """
+        Reconstruct the database as it was at a given version.
+
+        Parameters:
+        - version: Version number to reconstruct (latest if None)
+
+        Returns a WellnessAnalyzer with the locations as of that version.
+        """
+        if version is None:
+            version = self.latest_version
+
+        analyzer = WellnessAnalyzer()
+        for name, history in self.info_history.items():
+            info = self._value_at(history, version)
+            if info is not None:
+                analyzer.add_location(Location(name, *info))
+
+        for (name, factor), history in self.score_history.items():
+            location = analyzer.get_location(name)
+            score = self._value_at(history, version)
+            if location is not None and score is not None:
+                location.scores[factor] = score
+
+        for (name, factor), history in self.note_history.items():
+            location = analyzer.get_location(name)
+            note = self._value_at(history, version)
+            if location is not None and note is not None:
+                location.notes[factor] = note
+
+        return analyzer
+
+    def trend(self, location_name, factor):
+        """
+        Get how one location's score for a factor changed across versions.
+
+        Parameters:
+        - location_name: Name of the location
+        - factor: Wellness factor to follow
+
+        Returns a pandas DataFrame with one row per change (None when removed).
+        """
+        timestamps = {v['version']: v['timestamp'] for v in self.versions}
+        history = self.score_history.get((location_name, factor), [])
+
+        return pd.DataFrame({
+            'Version': [version for version, _ in history],
+            'Timestamp': [timestamps[version] for version, _ in history],
+            factor: [score for _, score in history]
+        })
@@ -0,0 +1,280 @@
+# scripts/sharded_analyzer.py
+import multiprocessing as mp
+import os
+import sys
+import zlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import WellnessAnalyzer
+
+
+def _worker_loop(conn):
+    """
+    Serve commands for one shard until told to stop.
+
+    Each shard is a plain WellnessAnalyzer plus the global insertion
+    sequence number of each of its locations, which the coordinator uses to
+    merge results in the same order as a single analyzer.
+    """
+    analyzer = WellnessAnalyzer()
+    sequence = {}
+
+    while True:
+        command, args = conn.recv()
+
+        if command == 'stop':
+            conn.close()
+            return
+
+        try:
+            if command == 'add':
+                for seq, location in args:
+                    analyzer.add_location(location)
+                    sequence[location.name] = seq
+                result = len(analyzer.locations)
+
+            elif command == 'remove':
+                for name in args:
+                    analyzer.remove_location(name)
+                    sequence.pop(name, None)
+                result = len(analyzer.locations)
+
+            elif command == 'compare':
+                # Only the sequence numbers and the metric go back; the
+                # coordinator already holds the name, country and type
+                factor, category = args
+                df = analyzer.compare_locations(factor, category)
+                if df.empty:
+                    result = None
+                else:
+                    metric = df.columns[-1]
+                    result = (metric, df['Location'].map(sequence).to_numpy(), df[metric].to_numpy())
+
+            elif command == 'top_k':
+                factor, category, k = args
+                df = analyzer.compare_locations(factor, category)
+                if not df.empty:
+                    df.insert(0, '_seq', df['Location'].map(sequence))
+                    metric = df.columns[-1]
+                    df = df.sort_values([metric, '_seq'], ascending=[False, True]).head(k)
+                result = df
+
+            else:
+                raise ValueError(f"Unknown command: {command}")
+
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', e))
+
+
+class ShardedAnalyzer:
+    """
+    Spreads locations across worker processes and answers queries by
+    scatter-gather.
+
+    Results are merged in global insertion order, so compare_locations and
+    top_k return exactly what a single WellnessAnalyzer holding the same
+    locations would.
+    """
+    def __init__(self, n_workers=None, partition='hash'):
+        """
+        Start the worker processes.
+
+        Parameters:
+        - n_workers: Number of shards (defaults to the number of CPU cores)
+        - partition: 'hash' to spread by location name, 'country' to keep countries together
+        """
+        if partition not in ('hash', 'country'):
+            raise ValueError("partition must be 'hash' or 'country'")
+
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.partition = partition
+        self.shard_of = {}
+        self.sequence = {}
+        self.next_seq = 0
+        # Country and type of each location, in insertion order like sequence
+        self.details = {}
+        self._columns = None
+
+        self.connections = []
+        self.processes = []
+        for _ in range(self.n_workers):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(target=_worker_loop, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    @classmethod
+    def from_analyzer(cls, analyzer, n_workers=None, partition='hash'):
+        """Create a sharded copy of an existing WellnessAnalyzer."""
+        sharded = cls(n_workers, partition)
+        sharded.add_locations(analyzer.locations.values())
+        return sharded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """Stop all worker processes."""
+        for conn in self.connections:
+            try:
+                conn.send(('stop', None))
+                conn.close()
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join()
+        self.connections = []
+        self.processes = []
+
+    def _shard_for(self, location):
+        """Pick the shard for a location (stable across runs)."""
+        key = location.country if self.partition == 'country' else location.name
+        return zlib.crc32(key.encode('utf-8')) % self.n_workers
+
+    def _scatter(self, requests):
+        """
+        Send one command per shard, then collect all replies.
+
+        Parameters:
+        - requests: Dict mapping shard index to (command, args)
+
+        Returns a dict mapping shard index to result.
+        """
+        for shard, request in requests.items():
+            self.connections[shard].send(request)
+
+        results = {}
+        errors = []
+        for shard in requests:
+            status, result = self.connections[shard].recv()
+            if status == 'error':
+                errors.append(result)
+            else:
+                results[shard] = result
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def add_location(self, location):
+        """Add a location to its shard."""
+        self.add_locations([location])
+
+    def add_locations(self, locations):
+        """Add many locations, sending one batch per shard."""
+        batches = {}
+        removals = {}
+
+        for location in locations:
+            shard = self._shard_for(location)
+            previous = self.shard_of.get(location.name)
+
+            # Re-adding keeps the original position, as with a dict
+            if previous is None:
+                self.sequence[location.name] = self.next_seq
+                self.next_seq += 1
+            elif previous != shard:
+                removals.setdefault(previous, []).append(location.name)
+
+            self.shard_of[location.name] = shard
+            self.details[location.name] = (location.country, location.location_type)
+            batches.setdefault(shard, []).append((self.sequence[location.name], location))
+
+        self._columns = None
+        if removals:
+            self._scatter({shard: ('remove', names) for shard, names in removals.items()})
+        if batches:
+            self._scatter({shard: ('add', batch) for shard, batch in batches.items()})
+
+    def __len__(self):
+        return len(self.shard_of)
+
+    def _gather_frames(self, command, args):
+        """Scatter a query to every shard and concatenate the non-empty frames."""
+        results = self._scatter({shard: (command, args) for shard in range(self.n_workers)})
+        frames = [df for _, df in sorted(results.items()) if not df.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def _location_columns(self):
+        """Location, Country and Type of every location in insertion order (cached until the next add)."""
+        if self._columns is None:
+            self._columns = pd.DataFrame({
+                'Location': list(self.details),
+                'Country': [country for country, _ in self.details.values()],
+                'Type': [location_type for _, location_type in self.details.values()]
+            })
+        return self._columns
+
+    def compare_locations(self, factor=None, category=None):
+        """
+        Compare locations by factor or category across all shards.
+
+        Each shard computes its metric and sends back only that column with
+        the sequence numbers, and the coordinator puts the values in
+        insertion order next to the name, country and type columns it keeps
+        itself. The result still has a row per location, so this part stays
+        O(N) in the coordinator; use top_k when only the best rows are needed.
+
+        Parameters:
+        - factor: Specific factor to compare
+        - category: Category to compare (average of factors)
+
+        Returns a pandas DataFrame identical to WellnessAnalyzer.compare_locations.
+        """
+        if factor and category:
+            raise ValueError("Specify either factor or category, not both")
+
+        results = self._scatter({shard: ('compare', (factor, category)) for shard in range(self.n_workers)})
+        replies = [reply for _, reply in sorted(results.items()) if reply is not None]
+        if not replies:
+            return pd.DataFrame()
+
+        metric = replies[0][0]
+        sequence = np.concatenate([seq for _, seq, _ in replies])
+        values = np.concatenate([column for _, _, column in replies])
+
+        # Sequence numbers follow insertion order, as do the cached columns
+        df = self._location_columns().copy()
+        df[metric] = values[np.argsort(sequence, kind='stable')]
+        return df
+
+    def top_k(self, k, factor=None, category=None):
+        """
+        Find the k best locations by factor, category average or overall score.
+
+        Each shard returns only its own top k, so at most k rows per shard
+        cross process boundaries. Ties are broken by insertion order, which
+        matches a stable descending sort of compare_locations.
+
+        Parameters:
+        - k: Number of locations to return
+        - factor: Specific factor to rank by
+        - category: Category to rank by (average of factors)
+
+        Returns a pandas DataFrame sorted best first.
+        """
+        if factor and category:
+            raise ValueError("Specify either factor or category, not both")
+
+        df = self._gather_frames('top_k', (factor, category, k))
+        if df.empty:
+            return df
+        metric = df.columns[-1]
+        df = df.sort_values([metric, '_seq'], ascending=[False, True]).head(k)
+        return df.drop(columns='_seq').reset_index(drop=True)
@@ -0,0 +1,290 @@
+# scripts/sqlite_storage.py
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+
+from scripts.location_analyzer import Location, WellnessAnalyzer, WELLNESS_CATEGORIES, ALL_FACTORS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    country TEXT NOT NULL,
+    location_type TEXT NOT NULL,
+    latitude REAL,
+    longitude REAL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    location_id INTEGER NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+    factor TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (location_id, factor)
+);
+CREATE TABLE IF NOT EXISTS notes (
+    location_id INTEGER NOT NULL REFERENCES locations(id) ON DELETE CASCADE,
+    factor TEXT NOT NULL,
+    note TEXT NOT NULL,
+    PRIMARY KEY (location_id, factor)
+);
+CREATE INDEX IF NOT EXISTS idx_locations_country ON locations(country);
+CREATE INDEX IF NOT EXISTS idx_locations_type ON locations(location_type);
+CREATE INDEX IF NOT EXISTS idx_scores_factor_score ON scores(factor, score);
+"""
+
+
+class SQLiteStore:
+    """
+    SQLite storage for locations, with comparisons and rankings run in SQL.
+    """
+    def __init__(self, db_path):
+        """
+        Open (or create) a location database.
+
+        Parameters:
+        - db_path: Path to the SQLite database file
+        """
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+
+        # Databases created before coordinates were added lack these columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(locations)")}
+        for column in ('latitude', 'longitude'):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE locations ADD COLUMN {column} REAL")
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    def load(self):
+        """Load every location into a WellnessAnalyzer."""
+        analyzer = WellnessAnalyzer()
+        by_id = {}
+
+        for loc_id, name, country, location_type, latitude, longitude in self.conn.execute(
+                "SELECT id, name, country, location_type, latitude, longitude FROM locations ORDER BY id"):
+            location = Location(name, country, location_type, latitude, longitude)
+            by_id[loc_id] = location
+            analyzer.add_location(location)
+
+        for loc_id, factor, score in self.conn.execute(
+                "SELECT location_id, factor, score FROM scores"):
+            by_id[loc_id].add_score(factor, score)
+
+        for loc_id, factor, note in self.conn.execute(
+                "SELECT location_id, factor, note FROM notes"):
+            by_id[loc_id].notes[factor] = note
+
+        return analyzer
+
+    def _stored_records(self):
+        """Every stored location as name -> (country, type, latitude, longitude, scores, notes)."""
+        records = {}
+        names = {}
+        for loc_id, name, country, location_type, latitude, longitude in self.conn.execute(
+                "SELECT id, name, country, location_type, latitude, longitude FROM locations"):
+            records[name] = (country, location_type, latitude, longitude, {}, {})
+            names[loc_id] = name
+
+        for loc_id, factor, score in self.conn.execute("SELECT location_id, factor, score FROM scores"):
+            records[names[loc_id]][4][factor] = score
+        for loc_id, factor, note in self.conn.execute("SELECT location_id, factor, note FROM notes"):
+            records[names[loc_id]][5][factor] = note
+
+        return records
+
+    def save(self, analyzer):
+        """
+        Save an analyzer's locations in one transaction, writing only changes.
+
+        The stored rows are compared with the analyzer: new and changed
+        locations are upserted and locations no longer in the analyzer are
+        deleted (matching save_data). Unchanged locations are not rewritten.
+
+        Returns a tuple (number of locations written, number deleted).
+        """
+        stored = self._stored_records()
+        changed = [
+            location for name, location in analyzer.locations.items()
+            if stored.get(name) != (location.country, location.location_type, location.latitude,
+                                    location.longitude, location.scores, location.notes)
+        ]
+        removed = [name for name in stored if name not in analyzer.locations]
+
+        with self.conn:
+            self.conn.executemany("DELETE FROM locations WHERE name = ?", [(name,) for name in removed])
+            self._write_locations(changed)
+
+        return len(changed), len(removed)
+
+    def upsert_location(self, location):
+        """Insert or update a single location without touching the others."""
+        with self.conn:
+            self._write_locations([location])
+
+    def _write_locations(self, locations):
+        """
+        Bulk upsert locations and replace their scores and notes (caller holds
+        the transaction). Existing locations keep their id, and so their order.
+        """
+        locations = list(locations)
+        if not locations:
+            return
+
+        self.conn.executemany(
+            """INSERT INTO locations (name, country, location_type, latitude, longitude) VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET country = excluded.country,
+                   location_type = excluded.location_type,
+                   latitude = excluded.latitude, longitude = excluded.longitude""",
+            [(loc.name, loc.country, loc.location_type, loc.latitude, loc.longitude) for loc in locations]
+        )
+
+        # Resolve the ids with a temporary name table rather than one query per location
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS pending (name TEXT PRIMARY KEY)")
+        self.conn.execute("DELETE FROM pending")
+        self.conn.executemany("INSERT INTO pending (name) VALUES (?)", [(loc.name,) for loc in locations])
+        ids = dict(self.conn.execute(
+            "SELECT l.name, l.id FROM locations l JOIN pending p ON p.name = l.name"))
+
+        self.conn.execute("DELETE FROM scores WHERE location_id IN "
+                          "(SELECT l.id FROM locations l JOIN pending p ON p.name = l.name)")
+        self.conn.execute("DELETE FROM notes WHERE location_id IN "
+                          "(SELECT l.id FROM locations l JOIN pending p ON p.name = l.name)")
+        self.conn.executemany(
+            "INSERT INTO scores (location_id, factor, score) VALUES (?, ?, ?)",
+            [(ids[loc.name], factor, score) for loc in locations for factor, score in loc.scores.items()]
+        )
+        self.conn.executemany(
+            "INSERT INTO notes (location_id, factor, note) VALUES (?, ?, ?)",
+            [(ids[loc.name], factor, note) for loc in locations for factor, note in loc.notes.items()]
+        )
+
+    def _metric_query(self, factor=None, category=None):
+        """
+        Build the SQL and parameters that compute one metric per location.
+
+        Returns a tuple (metric column name, SQL, parameters). Missing factors
+        count as 0 for a single factor, and are skipped in averages (a
+        location with no scores averages 0), as in WellnessAnalyzer.
+        """
+        if factor and category:
+            raise ValueError("Specify either factor or category, not both")
+
+        if factor:
+            if factor not in ALL_FACTORS:
+                raise ValueError(f"Unknown factor: {factor}")
+            metric = factor
+            factors = [factor]
+        elif category:
+            if category not in WELLNESS_CATEGORIES:
+                raise ValueError(f"Unknown category: {category}")
+            metric = f'{category} (Average)'
+            factors = WELLNESS_CATEGORIES[category]
+        else:
+            metric = 'Overall Score'
+            factors = ALL_FACTORS
+
+        placeholders = ", ".join("?" for _ in factors)
+        sql = f"""
+            SELECT l.name AS "Location", l.country AS "Country", l.location_type AS "Type",
+                   COALESCE(AVG(s.score), 0) AS metric
+            FROM locations l
+            LEFT JOIN scores s ON s.location_id = l.id AND s.factor IN ({placeholders})
+        """
+        return metric, sql, list(factors)
+
+    def compare_locations(self, factor=None, category=None):
+        """
+        Compare locations by factor or category, computed in SQL.
+
+        Parameters:
+        - factor: Specific factor to compare
+        - category: Category to compare (average of factors)
+
+        Returns a pandas DataFrame in the same shape as WellnessAnalyzer.compare_locations.
+        """
+        metric, sql, params = self._metric_query(factor, category)
+        df = pd.read_sql_query(sql + " GROUP BY l.id ORDER BY l.id", self.conn, params=params)
+        return df.rename(columns={'metric': metric})
+
+    def rank_locations(self, factor=None, category=None, top=None, country=None, location_type=None):
+        """
+        Rank locations by factor, category average or overall score in SQL.
+
+        Parameters:
+        - factor: Specific factor to rank by
+        - category: Category to rank by (average of factors)
+        - top: Optional number of locations to return
+        - country: Optional country filter
+        - location_type: Optional location type filter
+
+        Returns a pandas DataFrame sorted best first, with a 'Rank' column.
+        """
+        metric, sql, params = self._metric_query(factor, category)
+
+        conditions = []
+        if country:
+            conditions.append("l.country = ?")
+            params.append(country)
+        if location_type:
+            conditions.append("l.location_type = ?")
+            params.append(location_type)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+
+        sql += " GROUP BY l.id ORDER BY metric DESC, l.id"
+        if top is not None:
+            sql += " LIMIT ?"
+            params.append(int(top))
+
+        df = pd.read_sql_query(sql, self.conn, params=params).rename(columns={'metric': metric})
+        df.insert(0, 'Rank', range(1, len(df) + 1))
+        return df
+
+
+def load_sqlite_data(db_path):
+    """Load existing location data from a SQLite database."""
+    store = SQLiteStore(db_path)
+    try:
+        return store.load()
+    finally:
+        store.close()
+
+
+def save_sqlite_data(analyzer, db_path):
+    """Save location data to a SQLite database."""
+    store = SQLiteStore(db_path)
+    try:
+        written, removed = store.save(analyzer)
+    finally:
+        store.close()
+
+    print(f"Data saved to {db_path} ({written} locations written, {removed} removed)")
+
+
+if __name__ == "__main__":
+    # Migrate the JSON database into SQLite
+    from scripts.add_location import load_existing_data
+
+    json_file = os.path.join(project_root, "data", "processed", "locations.json")
+    db_file = os.path.join(project_root, "data", "processed", "locations.db")
+
+    analyzer = load_existing_data(json_file)
+    save_sqlite_data(analyzer, db_file)
+    print(f"Migrated {len(analyzer.locations)} locations")
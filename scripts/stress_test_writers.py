@@ -0,0 +1,98 @@
+# scripts/stress_test_writers.py
+import argparse
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import Process
+from pathlib import Path
+
+# Add the project root to path to enable imports
+script_dir = Path(__file__).parent
+project_root = script_dir.parent
+sys.path.append(str(project_root))
+sys.path.append(str(script_dir))
+
+from scripts.location_analyzer import Location, WellnessAnalyzer, ALL_FACTORS
+from scripts.add_location import load_existing_data, save_data
+
+SHARED_LOCATION = "Shared Town"
+
+
+def writer(writer_id, rounds, file_path):
+    """
+    One analyst session: load, change, save, repeated.
+
+    Every round adds a new location and updates this writer's own factor
+    on a location that all writers edit.
+    """
+    for round_number in range(1, rounds + 1):
+        analyzer = load_existing_data(file_path)
+
+        location = Location(f"Writer {writer_id} Round {round_number}", "Testland", "Test Town")
+        location.add_score("Healthcare Quality", 1 + (writer_id + round_number) % 10)
+        analyzer.add_location(location)
+
+        shared = analyzer.get_location(SHARED_LOCATION)
+        factor = ALL_FACTORS[writer_id % len(ALL_FACTORS)]
+        shared.add_score(factor, min(round_number, 10), f"Writer {writer_id}")
+
+        save_data(analyzer, file_path, verbose=False)
+
+
+def run_stress_test(writers, rounds, file_path):
+    """
+    Run parallel writer processes against one database and count lost updates.
+
+    Parameters:
+    - writers: Number of writer processes
+    - rounds: Load/modify/save cycles per writer
+    - file_path: JSON database to write to (overwritten)
+
+    Returns the number of lost updates.
+    """
+    analyzer = WellnessAnalyzer()
+    analyzer.add_location(Location(SHARED_LOCATION, "Testland", "Test Town"))
+    if os.path.exists(file_path):
+        os.remove(file_path)
+    save_data(analyzer, file_path, verbose=False)
+
+    start = time.perf_counter()
+    processes = [Process(target=writer, args=(w, rounds, file_path)) for w in range(writers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    final = load_existing_data(file_path)
+    lost = 0
+
+    for w in range(writers):
+        for r in range(1, rounds + 1):
+            if f"Writer {w} Round {r}" not in final.locations:
+                lost += 1
+
+    # Writers sharing a factor (more writers than factors) race on the same cell
+    shared = final.get_location(SHARED_LOCATION)
+    for w in range(min(writers, len(ALL_FACTORS))):
+        factor = ALL_FACTORS[w]
+        if shared is None or shared.get_score(factor) != min(rounds, 10):
+            lost += 1
+
+    expected = writers * rounds
+    print(f"{writers} writers x {rounds} saves in {elapsed:.1f}s")
+    print(f"Locations: {len(final.locations) - 1}/{expected} writer locations present")
+    print(f"Lost updates: {lost}")
+    return lost
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check concurrent save_data writers for lost updates")
+    parser.add_argument('--writers', type=int, default=16)
+    parser.add_argument('--rounds', type=int, default=10)
+    parser.add_argument('--file', default=os.path.join(tempfile.gettempdir(), "stress_locations.json"))
+    args = parser.parse_args()
+
+    lost = run_stress_test(args.writers, args.rounds, args.file)
+    sys.exit(1 if lost else 0)